@@ -1,13 +1,12 @@
 from app import create_app
-from app.seed_db import seed_database
-import os
+from app.services.lexicon import warm_lexicon
 from waitress import serve
 
 app = create_app()
 
-with app.app_context():
-    seed_database()
+if app.config.get('LEXICON_WARMUP'):
+    warm_lexicon(app)
 
 if __name__ == '__main__':
     print("Starting server on http://localhost:5000")
-    serve(app, host='localhost', port=5000) 
\ No newline at end of file
+    serve(app, host='localhost', port=5000) 
@@ -1,19 +1,24 @@
 import os
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
 from dotenv import load_dotenv
 from flask_cors import CORS
+from app.database import engine_options, install_sqlite_pragmas
 
 load_dotenv()
 
 db = SQLAlchemy()
 jwt = JWTManager()
+migrate = Migrate()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
 
 def create_app(test_config=None):
     app = Flask(__name__, instance_relative_config=True)
     
-    CORS(app)
+    CORS(app, expose_headers=['X-Next-Cursor'])
     
     if test_config is None:
         app.config.from_mapping(
@@ -21,17 +26,74 @@ def create_app(test_config=None):
             SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URI', 'sqlite:///cognitive_app.db'),
             SQLALCHEMY_TRACK_MODIFICATIONS=False,
             JWT_SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
-            JWT_ACCESS_TOKEN_EXPIRES=86400,
+            JWT_ACCESS_TOKEN_EXPIRES=int(os.environ.get('JWT_ACCESS_TOKEN_EXPIRES', 900)),
+            JWT_REFRESH_TOKEN_EXPIRES=int(os.environ.get('JWT_REFRESH_TOKEN_EXPIRES', 2592000)),
+            JWT_BLOCKLIST_BACKEND=os.environ.get('JWT_BLOCKLIST_BACKEND', 'database'),
+            JWT_BLOCKLIST_SYNC_INTERVAL=int(os.environ.get('JWT_BLOCKLIST_SYNC_INTERVAL', 5)),
+            JWT_BLOCKLIST_SYNC_OVERLAP=int(os.environ.get('JWT_BLOCKLIST_SYNC_OVERLAP', 60)),
             JWT_TOKEN_LOCATION=['headers'],
             JWT_HEADER_NAME='Authorization',
-            JWT_HEADER_TYPE='Bearer'
+            JWT_HEADER_TYPE='Bearer',
+            ASYNC_SCORING=os.environ.get('ASYNC_SCORING', 'false').lower() == 'true',
+            SCORING_WORKERS=int(os.environ.get('SCORING_WORKERS', 4)),
+            SCORING_SWEEP_INTERVAL=int(os.environ.get('SCORING_SWEEP_INTERVAL', 60)),
+            SCORING_RETRY_AFTER=int(os.environ.get('SCORING_RETRY_AFTER', 60)),
+            SCORING_MAX_ATTEMPTS=int(os.environ.get('SCORING_MAX_ATTEMPTS', 3)),
+            USER_CACHE_SIZE=int(os.environ.get('USER_CACHE_SIZE', 1024)),
+            USER_CACHE_TTL=int(os.environ.get('USER_CACHE_TTL', 300)),
+            JWT_TRUST_IDENTITY_CLAIMS=os.environ.get('JWT_TRUST_IDENTITY_CLAIMS', 'false').lower() == 'true',
+            PASSWORD_HASH_METHOD=os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000'),
+            PASSWORD_HASH_WORKERS=int(os.environ.get('PASSWORD_HASH_WORKERS', 0)),
+            PASSWORD_HASH_MAX_PENDING=int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 16)),
+            REQUEST_LOGGING=os.environ.get('REQUEST_LOGGING', 'true').lower() == 'true',
+            DB_POOL_SIZE=int(os.environ.get('DB_POOL_SIZE', 5)),
+            DB_MAX_OVERFLOW=int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            DB_POOL_RECYCLE=int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            DB_POOL_TIMEOUT=int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            SQLITE_JOURNAL_MODE=os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+            SQLITE_BUSY_TIMEOUT=int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+            SQLITE_SYNCHRONOUS=os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+            LEXICON_WARMUP=os.environ.get('LEXICON_WARMUP', 'true').lower() == 'true',
+            SCORE_CACHE_BACKEND=os.environ.get('SCORE_CACHE_BACKEND', 'memory'),
+            SCORE_CACHE_SIZE=int(os.environ.get('SCORE_CACHE_SIZE', 10000)),
+            SCORE_CACHE_TTL=int(os.environ.get('SCORE_CACHE_TTL', 3600)),
+            SCORE_CACHE_URL=os.environ.get('SCORE_CACHE_URL'),
+            ASGI_THREADS=int(os.environ.get('ASGI_THREADS', 32)),
+            MAX_CONTENT_LENGTH=int(os.environ.get('MAX_CONTENT_LENGTH', 4 * 1024 * 1024)),
+            JSON_PROVIDER=os.environ.get('JSON_PROVIDER', 'default'),
+            LEXICON_SYNC_INTERVAL=int(os.environ.get('LEXICON_SYNC_INTERVAL', 5)),
+            METRICS_TOKEN=os.environ.get('METRICS_TOKEN'),
+            ADMIN_USERNAMES=[name.strip() for name in os.environ.get('ADMIN_USERNAMES', '').split(',') if name.strip()]
         )
     else:
         app.config.from_mapping(test_config)
     
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    
     db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR)
+    with app.app_context():
+        install_sqlite_pragmas(db.engine, app.config)
     jwt.init_app(app)
     
+    from app.services.scoring import ScoringQueue
+    from app.services.identity import IdentityResolver
+    from app.services.passwords import PasswordHasher
+    from app.services.blocklist import create_blocklist
+    from app.services.score_cache import create_score_cache
+    from app.services.serialization import create_json_provider
+    app.json = create_json_provider(app)
+    app.extensions['scoring_queue'] = ScoringQueue(app)
+    app.extensions['identity_resolver'] = IdentityResolver(app)
+    app.extensions['password_hasher'] = PasswordHasher(app)
+    app.extensions['token_blocklist'] = create_blocklist(app)
+    app.extensions['score_cache'] = create_score_cache(app)
+    
+    from app.services import metrics
+    app_metrics = metrics.init_app(app)
+    app_metrics.register_collector(lambda: metrics.cache_lines('user_cache', app.extensions['identity_resolver'].cache))
+    app_metrics.register_collector(lambda: metrics.cache_lines('score_cache', app.extensions['score_cache']))
+    
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
         print(f"Expired token: {jwt_payload.get('sub', 'unknown user')}")
@@ -61,8 +123,20 @@ def create_app(test_config=None):
     
     @jwt.token_in_blocklist_loader
     def token_in_blocklist_callback(jwt_header, jwt_payload):
-        print(f"Blocked token for user: {jwt_payload.get('sub', 'unknown')}")
-        return False
+        return app.extensions['token_blocklist'].is_revoked(jwt_payload['jti'])
+    
+    @jwt.revoked_token_loader
+    def revoked_token_callback(jwt_header, jwt_payload):
+        return jsonify({
+            'message': 'The token has been revoked',
+            'error': 'token_revoked'
+        }), 401
+    
+    @app.before_request
+    def reject_too_large_body():
+        max_length = app.config.get('MAX_CONTENT_LENGTH')
+        if max_length is not None and (request.content_length or 0) > max_length:
+            return jsonify({'message': 'Request body too large'}), 413
     
     @jwt.user_identity_loader
     def user_identity_lookup(user):
@@ -72,27 +146,31 @@ def create_app(test_config=None):
     def user_lookup_callback(_jwt_header, jwt_data):
         identity = jwt_data["sub"]
         try:
-            user_id = int(identity)
-            from app.models.user import User
-            return User.query.filter_by(id=user_id).one_or_none()
+            return app.extensions['identity_resolver'].resolve(jwt_data)
         except (ValueError, TypeError):
             print(f"Error converting identity to integer: {identity}")
             return None
     
     from app.routes.auth import auth_bp
     from app.routes.journals import journals_bp
+    from app.routes.users import users_bp
+    from app.routes.metrics import metrics_bp
     from app.routes.ui import ui_bp
+    from app.routes.admin import admin_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(journals_bp)
+    app.register_blueprint(users_bp)
+    app.register_blueprint(metrics_bp)
     app.register_blueprint(ui_bp)
+    app.register_blueprint(admin_bp)
+    
+    from app.commands import register_commands
+    register_commands(app)
     
     try:
         os.makedirs(app.instance_path)
     except OSError:
         pass
-    
-    with app.app_context():
-        db.create_all()
 
     return app 
\ No newline at end of file
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+from a2wsgi import WSGIMiddleware
+
+TOO_LARGE_BODY = b'{"message": "Request body too large"}'
+
+def declared_length(scope):
+    """The request's Content-Length header, or None if it is missing or malformed."""
+    for name, value in scope.get('headers', ()):
+        if name.lower() == b'content-length':
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+async def reject_too_large(send):
+    await send({
+        'type': 'http.response.start',
+        'status': HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(TOO_LARGE_BODY)).encode())]
+    })
+    await send({'type': 'http.response.body', 'body': TOO_LARGE_BODY})
+
+def create_asgi_app(flask_app, shutdown=None):
+    """Serve a Flask app to an ASGI server.
+
+    The event loop owns the connections and reads request bodies, so slow or
+    idle clients cost a socket rather than a worker thread; Flask views, SQL
+    and the analyzer run on a pool of ASGI_THREADS threads and never block
+    the loop. Bodies are buffered in memory, so they are counted while they
+    are read and answered with 413 once they exceed MAX_CONTENT_LENGTH.
+    shutdown is called on lifespan shutdown.
+    """
+    wsgi_app = WSGIMiddleware(flask_app, workers=flask_app.config.get('ASGI_THREADS', 32))
+    max_length = flask_app.config.get('MAX_CONTENT_LENGTH')
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if shutdown is not None:
+                    shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def app(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await lifespan(receive, send)
+        if scope['type'] != 'http':
+            return await wsgi_app(scope, receive, send)
+
+        if max_length is not None and (declared_length(scope) or 0) > max_length:
+            return await reject_too_large(send)
+
+        chunks, length = [], 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body = message.get('body', b'')
+            length += len(body)
+            if max_length is not None and length > max_length:
+                return await reject_too_large(send)
+            chunks.append(body)
+            if not message.get('more_body'):
+                break
+
+        buffered = [{'type': 'http.request', 'body': b''.join(chunks), 'more_body': False}]
+
+        async def replay():
+            if buffered:
+                return buffered.pop()
+            return await receive()
+
+        await wsgi_app(scope, replay, send)
+
+    return app
@@ -0,0 +1,79 @@
+import json
+import os
+import click
+from app import db
+
+def register_commands(app):
+    """Attach the management commands to the app's `flask` CLI."""
+
+    @app.cli.command('seed-db')
+    def seed_db_command():
+        """Insert the default word lists into an empty lexicon."""
+        from app.seed_db import seed_if_empty
+
+        if seed_if_empty():
+            click.echo("Database seeded successfully.")
+        else:
+            click.echo("Database already seeded. Skipping.")
+
+    @app.cli.command('rebuild-rollups')
+    @click.option('--user-id', type=int, default=None, help='Only rebuild the rollups of this user.')
+    def rebuild_rollups_command(user_id):
+        """Recompute score rollups from the journal_score table."""
+        from app.services.rollups import rebuild_rollups
+
+        count = rebuild_rollups(user_id=user_id)
+        db.session.commit()
+        click.echo(f"Rebuilt {count} rollup rows.")
+
+    @app.cli.command('rescore')
+    @click.option('--workers', type=int, default=os.cpu_count() or 1, show_default=True,
+                  help='Number of scoring processes.')
+    @click.option('--batch-size', type=int, default=1000, show_default=True,
+                  help='Number of journal ids per chunk.')
+    @click.option('--checkpoint', type=click.Path(dir_okay=False), default=None,
+                  help='File recording finished chunks; an existing file resumes the run.')
+    @click.option('--stale-only', is_flag=True,
+                  help='Only rescore journals scored with another lexicon version, or not scored at all.')
+    def rescore_command(workers, batch_size, checkpoint, stale_only):
+        """Rescore every journal against the current lexicon."""
+        from app.rescore_db import rescore_journals
+
+        def report(finished, total, rescored):
+            click.echo(f"[{finished}/{total} chunks] {rescored} journals rescored")
+
+        try:
+            rescored = rescore_journals(batch_size=batch_size, workers=workers, checkpoint=checkpoint,
+                                        progress=report, stale_only=stale_only)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+        click.echo(f"Rescoring complete: {rescored} journals.")
+
+    @app.cli.command('publish-lexicon')
+    @click.option('--file', 'path', type=click.Path(exists=True, dir_okay=False), default=None,
+                  help='JSON object of category names to word lists or {word: weight} objects that replaces the word tables.')
+    @click.option('--note', default=None, help='Description stored with the version.')
+    def publish_lexicon_command(path, note):
+        """Publish the word lists as a new lexicon version that every worker switches to."""
+        from app.services.lexicon import publish_lexicon
+
+        category_words = None
+        if path:
+            with open(path) as words_file:
+                category_words = json.load(words_file)
+        try:
+            version = publish_lexicon(category_words, note=note)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+        click.echo(f"Published lexicon version {version.id}. "
+                   "Run 'flask rescore --stale-only' to rescore journals scored with older versions.")
+
+    @app.cli.command('purge-token-blocklist')
+    def purge_token_blocklist_command():
+        """Delete revoked-token rows whose tokens have expired anyway."""
+        from app.services.blocklist import DatabaseBlocklist
+
+        blocklist = app.extensions['token_blocklist']
+        if not isinstance(blocklist, DatabaseBlocklist):
+            raise click.UsageError('The token blocklist is not database-backed.')
+        click.echo(f"Removed {blocklist.purge_expired()} expired entries.")
@@ -0,0 +1,54 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+def engine_options(config):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings in config.
+
+    Pooled connections are pre-pinged and recycled so that workers survive
+    database restarts and server-side idle timeouts. In-memory SQLite keeps
+    Flask-SQLAlchemy's single static connection.
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    options = {'pool_pre_ping': config.get('DB_POOL_PRE_PING', True)}
+    if _is_memory_sqlite(url):
+        return options
+
+    options.update(
+        pool_size=config.get('DB_POOL_SIZE', 5),
+        max_overflow=config.get('DB_MAX_OVERFLOW', 10),
+        pool_recycle=config.get('DB_POOL_RECYCLE', 1800),
+        pool_timeout=config.get('DB_POOL_TIMEOUT', 30)
+    )
+    if url.get_backend_name() == 'sqlite':
+        options['connect_args'] = {'timeout': config.get('SQLITE_BUSY_TIMEOUT', 5000) / 1000}
+    return options
+
+def install_sqlite_pragmas(engine, config):
+    """Apply journal mode, busy timeout and synchronous pragmas to every new SQLite connection.
+
+    WAL lets readers proceed while a writer commits and, with a busy timeout,
+    makes concurrent writers from several workers wait for the lock instead of
+    failing with "database is locked". synchronous=NORMAL is durable under WAL
+    except for the last transactions before a power loss.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(config.get('SQLITE_BUSY_TIMEOUT', 5000))}",
+        f"PRAGMA synchronous = {config.get('SQLITE_SYNCHRONOUS', 'NORMAL')}"
+    ]
+    if not _is_memory_sqlite(engine.url):
+        pragmas.insert(0, f"PRAGMA journal_mode = {config.get('SQLITE_JOURNAL_MODE', 'WAL')}")
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
@@ -1,3 +1,7 @@
 from app.models.user import User
 from app.models.journal import Journal, JournalScore
-from app.models.word_category import WordCategory, Word 
\ No newline at end of file
+from app.models.word_category import WordCategory, Word
+from app.models.score_rollup import ScoreRollup
+from app.models.token_blocklist import TokenBlocklist
+from app.models.journal_version import JournalVersion
+from app.models.lexicon_version import LexiconVersion
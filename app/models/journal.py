@@ -1,10 +1,15 @@
 from datetime import datetime
+from sqlalchemy import DDL, event
 from app import db
 
 class Journal(db.Model):
+    __table_args__ = (
+        db.Index('ix_journal_user_id_created_at', 'user_id', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     scores = db.relationship('JournalScore', backref='journal', lazy=True, uselist=False)
 
@@ -13,13 +18,43 @@ class Journal(db.Model):
 
 class JournalScore(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    journal_id = db.Column(db.Integer, db.ForeignKey('journal.id'), nullable=False)
+    journal_id = db.Column(db.Integer, db.ForeignKey('journal.id'), nullable=False, unique=True, index=True)
     positive_emotion = db.Column(db.Integer, default=0)
     negative_emotion = db.Column(db.Integer, default=0)
     social = db.Column(db.Integer, default=0)
     cognitive = db.Column(db.Integer, default=0)
     total_score = db.Column(db.Integer, default=0)
+    # Every category of the lexicon version, e.g. {"social": 2, "work": 1.5};
+    # the columns above keep the built-in ones, rounded, for the rollups.
+    category_scores = db.Column(db.JSON(none_as_null=True))
+    token_count = db.Column(db.Integer)
+    lexicon_version = db.Column(db.Integer, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def __repr__(self):
-        return f'<JournalScore for Journal {self.journal_id}>' 
\ No newline at end of file
+        return f'<JournalScore for Journal {self.journal_id}>' 
+# Full-text search index over journal text, maintained by the database. On
+# SQLite an external-content FTS5 table is kept in sync by triggers; user_id
+# is indexed too so a search only visits the user's own entries. PostgreSQL
+# uses a GIN index on the text's tsvector. See app/services/search.py.
+SEARCH_DDL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS journal_fts USING fts5("
+        "text, user_id, content='journal', content_rowid='id', tokenize='porter unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS journal_fts_insert AFTER INSERT ON journal BEGIN "
+        "INSERT INTO journal_fts (rowid, text, user_id) VALUES (new.id, new.text, new.user_id); END",
+        "CREATE TRIGGER IF NOT EXISTS journal_fts_delete AFTER DELETE ON journal BEGIN "
+        "INSERT INTO journal_fts (journal_fts, rowid, text, user_id) VALUES ('delete', old.id, old.text, old.user_id); END",
+        "CREATE TRIGGER IF NOT EXISTS journal_fts_update AFTER UPDATE OF text, user_id ON journal BEGIN "
+        "INSERT INTO journal_fts (journal_fts, rowid, text, user_id) VALUES ('delete', old.id, old.text, old.user_id); "
+        "INSERT INTO journal_fts (rowid, text, user_id) VALUES (new.id, new.text, new.user_id); END"
+    ],
+    'postgresql': [
+        "CREATE INDEX IF NOT EXISTS ix_journal_text_search ON journal USING gin (to_tsvector('english', text))"
+    ]
+}
+
+for dialect, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Journal.__table__, 'after_create', DDL(statement).execute_if(dialect=dialect))
+event.listen(Journal.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS journal_fts').execute_if(dialect='sqlite'))
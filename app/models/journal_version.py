@@ -0,0 +1,10 @@
+from datetime import datetime
+from app import db
+
+class JournalVersion(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<JournalVersion user={self.user_id} v{self.version}>'
@@ -0,0 +1,17 @@
+from datetime import datetime
+from app import db
+
+class LexiconVersion(db.Model):
+    """An immutable, published snapshot of the word lists used for scoring.
+
+    The newest row is the lexicon every worker scores with; the word_category
+    and word tables are the working copy a new version is published from.
+    """
+
+    id = db.Column(db.Integer, primary_key=True)
+    words = db.Column(db.JSON, nullable=False)
+    note = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<LexiconVersion {self.id}>'
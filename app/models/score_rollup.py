@@ -0,0 +1,24 @@
+from datetime import date, datetime
+from app import db
+
+ALL_TIME = date(1970, 1, 1)
+
+class ScoreRollup(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'period', 'period_start', name='uq_score_rollup_user_period'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    period = db.Column(db.String(10), nullable=False)
+    period_start = db.Column(db.Date, nullable=False)
+    journal_count = db.Column(db.Integer, default=0, nullable=False)
+    positive_emotion = db.Column(db.Integer, default=0, nullable=False)
+    negative_emotion = db.Column(db.Integer, default=0, nullable=False)
+    social = db.Column(db.Integer, default=0, nullable=False)
+    cognitive = db.Column(db.Integer, default=0, nullable=False)
+    total_score = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ScoreRollup user={self.user_id} {self.period} {self.period_start}>'
@@ -1,5 +1,5 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import current_app
 from app import db
 
 class User(db.Model):
@@ -11,10 +11,11 @@ class User(db.Model):
     journals = db.relationship('Journal', backref='author', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        """Hash with the app's configured PasswordHasher, like /register and /login."""
+        self.password_hash = current_app.extensions['password_hasher'].hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return current_app.extensions['password_hasher'].verify(self.password_hash, password)
 
     def __repr__(self):
         return f'<User {self.username}>' 
\ No newline at end of file
@@ -10,7 +10,8 @@ class WordCategory(db.Model):
 
 class Word(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    word = db.Column(db.String(50), nullable=False)
+    word = db.Column(db.String(50), nullable=False, index=True)
+    weight = db.Column(db.Float, nullable=False, default=1.0, server_default='1')
     category_id = db.Column(db.Integer, db.ForeignKey('word_category.id'), nullable=False)
 
     def __repr__(self):
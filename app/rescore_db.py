@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from flask import current_app
+from sqlalchemy import select, insert, update, or_
+from app import create_app, db
+from app.models.journal import Journal, JournalScore
+from app.services.bulk_scoring import VectorizedScorer
+from app.services.rollups import rebuild_rollups
+from app.services.http_cache import bump_all_journal_versions
+from app.services.scoring import score_columns
+
+WORKER_CONFIG_KEYS = (
+    'SQLALCHEMY_DATABASE_URI', 'SQLALCHEMY_ENGINE_OPTIONS', 'SQLALCHEMY_TRACK_MODIFICATIONS',
+    'SECRET_KEY', 'JWT_SECRET_KEY'
+)
+
+class RescoreCheckpoint:
+    """Records finished chunks in a JSON file so an interrupted rescore can resume."""
+
+    def __init__(self, path, batch_size):
+        self.path = path
+        self.batch_size = batch_size
+        self.completed = set()
+
+        if os.path.exists(path):
+            with open(path) as checkpoint_file:
+                state = json.load(checkpoint_file)
+            if state['batch_size'] != batch_size:
+                raise ValueError(
+                    f"Checkpoint {path} was written with batch size {state['batch_size']}, not {batch_size}"
+                )
+            self.completed = set(state['completed'])
+
+    def mark(self, start_id):
+        self.completed.add(start_id)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, 'w') as checkpoint_file:
+            json.dump({'batch_size': self.batch_size, 'completed': sorted(self.completed)}, checkpoint_file)
+        os.replace(temporary_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def score_chunk(scorer, start_id, end_id, stale_only=False):
+    """Score journals with start_id <= id < end_id, returning (start_id, updates, inserts).
+
+    With stale_only, journals already scored with the scorer's lexicon version are skipped
+    unless their scores predate per-journal category scores.
+    """
+    statement = (
+        select(Journal.id, Journal.text, JournalScore.id.label('score_id'))
+        .outerjoin(JournalScore, JournalScore.journal_id == Journal.id)
+        .where(Journal.id >= start_id, Journal.id < end_id)
+        .order_by(Journal.id)
+    )
+    if stale_only:
+        statement = statement.where(or_(
+            JournalScore.id.is_(None),
+            JournalScore.lexicon_version.is_distinct_from(scorer.lexicon.version),
+            JournalScore.category_scores.is_(None)
+        ))
+    rows = db.session.execute(statement).all()
+
+    updates, inserts = [], []
+    for row, scores in zip(rows, scorer.score_texts([row.text for row in rows])):
+        columns = score_columns(scores, scorer.lexicon.version)
+        if row.score_id is None:
+            inserts.append({'journal_id': row.id, **columns})
+        else:
+            updates.append({'id': row.score_id, **columns})
+
+    return start_id, updates, inserts
+
+def write_scores(updates, inserts):
+    """Bulk-update existing JournalScore rows by primary key and insert missing ones."""
+    if updates:
+        db.session.execute(update(JournalScore), updates)
+    if inserts:
+        db.session.execute(insert(JournalScore), inserts)
+
+_worker_scorer = None
+
+def _init_worker(config):
+    global _worker_scorer
+
+    app = create_app(config)
+    app.app_context().push()
+    _worker_scorer = VectorizedScorer()
+
+def _score_chunk_in_worker(start_id, end_id, stale_only):
+    try:
+        return score_chunk(_worker_scorer, start_id, end_id, stale_only)
+    finally:
+        db.session.remove()
+
+def _score_chunks_in_pool(chunks, workers, stale_only):
+    config = {key: current_app.config[key] for key in WORKER_CONFIG_KEYS if key in current_app.config}
+    pending_chunks = iter(chunks)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,)) as executor:
+        in_flight = set()
+        while True:
+            for start_id, end_id in pending_chunks:
+                in_flight.add(executor.submit(_score_chunk_in_worker, start_id, end_id, stale_only))
+                if len(in_flight) >= workers * 2:
+                    break
+            if not in_flight:
+                return
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def rescore_journals(batch_size=1000, workers=1, checkpoint=None, progress=None, stale_only=False):
+    """Rescore every journal in id-range chunks, committing after each chunk.
+
+    With more than one worker the chunks are scored in a process pool, each
+    worker holding its own app, database connection and compiled lexicon; the
+    results are written back here. Passing a checkpoint path skips chunks
+    finished by an earlier, interrupted run. With stale_only, only journals
+    that are unscored or were scored with another lexicon version are rescored.
+    """
+    last_id = db.session.scalar(select(db.func.max(Journal.id))) or 0
+    chunks = [(start_id, start_id + batch_size) for start_id in range(1, last_id + 1, batch_size)]
+
+    state = RescoreCheckpoint(checkpoint, batch_size) if checkpoint else None
+    if state:
+        chunks = [chunk for chunk in chunks if chunk[0] not in state.completed]
+
+    if workers > 1 and len(chunks) > 1:
+        results = _score_chunks_in_pool(chunks, workers, stale_only)
+    else:
+        scorer = VectorizedScorer()
+        results = (score_chunk(scorer, start_id, end_id, stale_only) for start_id, end_id in chunks)
+
+    rescored = 0
+    for finished, (start_id, updates, inserts) in enumerate(results, start=1):
+        write_scores(updates, inserts)
+        db.session.commit()
+        rescored += len(updates) + len(inserts)
+        if state:
+            state.mark(start_id)
+        if progress:
+            progress(finished, len(chunks), rescored)
+
+    rebuild_rollups()
+    bump_all_journal_versions()
+    db.session.commit()
+    current_app.extensions['score_cache'].clear()
+    if state:
+        state.clear()
+    return rescored
+
+def rescore_database(batch_size=1000, workers=1, checkpoint=None):
+    """Rescore all journals against the current lexicon."""
+    app = create_app()
+
+    with app.app_context():
+        def report(finished, total, rescored):
+            print(f"Rescored {rescored} journals ({finished}/{total} chunks).")
+
+        rescored = rescore_journals(batch_size=batch_size, workers=workers, checkpoint=checkpoint, progress=report)
+        print(f"Rescoring complete: {rescored} journals.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rescore all journals against the current lexicon.")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--checkpoint', default=None)
+    args = parser.parse_args()
+    rescore_database(batch_size=args.batch_size, workers=args.workers, checkpoint=args.checkpoint)
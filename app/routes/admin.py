@@ -0,0 +1,67 @@
+from functools import wraps
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, current_user
+from app.models.lexicon_version import LexiconVersion
+from app.services.lexicon import get_lexicon, publish_lexicon, published_version
+from app import db
+from http import HTTPStatus
+from sqlalchemy.exc import SQLAlchemyError
+import logging
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+def admin_required(view):
+    """Require an access token of a user listed in ADMIN_USERNAMES."""
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if current_user is None or current_user.username not in current_app.config.get('ADMIN_USERNAMES', ()):
+            return jsonify({'message': 'Administrator access required'}), HTTPStatus.FORBIDDEN
+        return view(*args, **kwargs)
+    return wrapper
+
+@admin_bp.route('/lexicon', methods=['GET'])
+@admin_required
+def get_lexicon_versions():
+    """List the most recent lexicon versions and the version this worker scores with."""
+    try:
+        versions = LexiconVersion.query.order_by(LexiconVersion.id.desc()).limit(20).all()
+        lexicon = get_lexicon()
+        return jsonify({
+            'published_version': published_version(),
+            'loaded_version': lexicon.version,
+            'categories': list(lexicon.categories),
+            'versions': [{
+                'version': version.id,
+                'note': version.note,
+                'created_at': version.created_at.isoformat(),
+                'categories': list(version.words),
+                'word_count': sum(len(words) for words in version.words.values())
+            } for version in versions]
+        }), HTTPStatus.OK
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in get_lexicon_versions: {str(e)}")
+        return jsonify({'message': 'Failed to retrieve lexicon versions'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@admin_bp.route('/lexicon', methods=['POST'])
+@admin_required
+def publish_lexicon_version():
+    """Publish a new lexicon version from the posted categories or the current word tables."""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Request body must be a JSON object'}), HTTPStatus.BAD_REQUEST
+    note = data.get('note')
+    if note is not None and (not isinstance(note, str) or len(note) > 200):
+        return jsonify({'message': 'note must be a string of at most 200 characters'}), HTTPStatus.BAD_REQUEST
+    
+    try:
+        version = publish_lexicon(data.get('categories'), note=note)
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), HTTPStatus.BAD_REQUEST
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Database error in publish_lexicon_version: {str(e)}")
+        return jsonify({'message': 'Failed to publish lexicon'}), HTTPStatus.INTERNAL_SERVER_ERROR
+    
+    return jsonify({'version': version.id, 'note': version.note}), HTTPStatus.CREATED
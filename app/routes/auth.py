@@ -1,10 +1,12 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt
 from marshmallow import Schema, fields, ValidationError
 from app.models.user import User
+from app.services.passwords import HasherBusy
 from app import db
 from http import HTTPStatus
 from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime
 import logging
 
 auth_bp = Blueprint('auth', __name__, url_prefix='')
@@ -18,6 +20,12 @@ class LoginSchema(Schema):
     username = fields.String(required=True)
     password = fields.String(required=True)
 
+def busy_response():
+    """Shed load when the password hashing pool is saturated."""
+    response = jsonify({'message': 'Server is busy, please retry shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, HTTPStatus.SERVICE_UNAVAILABLE
+
 @auth_bp.route('/users', methods=['POST'])
 def register():
     """Register a new user."""
@@ -39,12 +47,15 @@ def register():
             return jsonify({'message': 'Email already exists'}), HTTPStatus.BAD_REQUEST
         
         user = User(username=validated_data['username'], email=validated_data['email'])
-        user.set_password(validated_data['password'])
+        user.password_hash = current_app.extensions['password_hasher'].hash(validated_data['password'])
         
         db.session.add(user)
         db.session.commit()
         
         return jsonify({'message': 'User created successfully', 'user_id': user.id}), HTTPStatus.CREATED
+    except HasherBusy:
+        db.session.rollback()
+        return busy_response()
     except SQLAlchemyError as e:
         db.session.rollback()
         logging.error(f"Database error in register: {str(e)}")
@@ -69,27 +80,69 @@ def login():
             return jsonify({'message': 'Invalid input', 'errors': err.messages}), HTTPStatus.BAD_REQUEST
         
         user = User.query.filter_by(username=validated_data['username']).first()
+        hasher = current_app.extensions['password_hasher']
         
-        if not user or not user.check_password(validated_data['password']):
+        if not user or not hasher.verify(user.password_hash, validated_data['password']):
             return jsonify({'message': 'Invalid username or password'}), HTTPStatus.UNAUTHORIZED
         
-        access_token = create_access_token(
-            identity=str(user.id),
-            additional_claims={
-                'username': user.username,
-                'email': user.email
-            }
-        )
+        if hasher.needs_rehash(user.password_hash):
+            user.password_hash = hasher.hash(validated_data['password'])
+            db.session.commit()
+        
+        claims = {
+            'username': user.username,
+            'email': user.email
+        }
+        access_token = create_access_token(identity=str(user.id), additional_claims=claims)
+        refresh_token = create_refresh_token(identity=str(user.id), additional_claims=claims)
         
         return jsonify({
             'message': 'Login successful',
             'access_token': access_token,
+            'refresh_token': refresh_token,
             'user_id': user.id,
             'username': user.username
         }), HTTPStatus.OK
+    except HasherBusy:
+        return busy_response()
     except SQLAlchemyError as e:
+        db.session.rollback()
         logging.error(f"Database error in login: {str(e)}")
         return jsonify({'message': 'Failed to authenticate user'}), HTTPStatus.INTERNAL_SERVER_ERROR
     except Exception as e:
         logging.error(f"Unexpected error in login: {str(e)}")
-        return jsonify({'message': 'An unexpected error occurred'}), HTTPStatus.INTERNAL_SERVER_ERROR 
\ No newline at end of file
+        return jsonify({'message': 'An unexpected error occurred'}), HTTPStatus.INTERNAL_SERVER_ERROR 
+
+@auth_bp.route('/token/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh_token():
+    """Issue a new access token from a refresh token, without a password check."""
+    refresh_claims = get_jwt()
+    access_token = create_access_token(
+        identity=refresh_claims['sub'],
+        additional_claims={
+            'username': refresh_claims.get('username'),
+            'email': refresh_claims.get('email')
+        }
+    )
+    
+    return jsonify({'access_token': access_token}), HTTPStatus.OK
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    """Revoke the access or refresh token used for this request."""
+    try:
+        token = get_jwt()
+        current_app.extensions['token_blocklist'].revoke(
+            jti=token['jti'],
+            token_type=token['type'],
+            user_id=int(token['sub']),
+            expires_at=datetime.utcfromtimestamp(token['exp'])
+        )
+        
+        return jsonify({'message': f"{token['type'].capitalize()} token revoked"}), HTTPStatus.OK
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Database error in logout: {str(e)}")
+        return jsonify({'message': 'Failed to revoke token'}), HTTPStatus.INTERNAL_SERVER_ERROR
@@ -1,11 +1,22 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app, json, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import Schema, fields, ValidationError
 from app.models.journal import Journal, JournalScore
 from app.services.text_analyzer import TextAnalyzer
+from app.services.lexicon import get_lexicon
+from app.services.scoring import score_journal, score_columns
+from app.services.serialization import SCORE_COLUMNS, JournalSerializer, score_payload, analyzer_score_payload
+from app.services.rollups import record_scores
+from app.services.search import search_terms, search_statement, encode_search_cursor, decode_search_cursor
+from app.services.http_cache import conditional_on_journal_version, bump_journal_version, current_journal_version
 from app import db
 from http import HTTPStatus
+from sqlalchemy import insert, select, or_, and_
 from sqlalchemy.exc import SQLAlchemyError
+from collections import defaultdict, deque
+from datetime import datetime
+import base64
+import binascii
 import logging
 
 journals_bp = Blueprint('journals', __name__, url_prefix='')
@@ -13,6 +24,22 @@ journals_bp = Blueprint('journals', __name__, url_prefix='')
 class JournalSchema(Schema):
     text = fields.String(required=True)
 
+JOURNAL_LIST_FIELDS = {'id', 'text', 'created_at', 'updated_at', 'score'}
+DEFAULT_JOURNAL_LIST_FIELDS = {'id', 'text', 'created_at', 'updated_at'}
+
+def encode_cursor(journal):
+    """Encode the (created_at, id) position of a journal as an opaque cursor."""
+    position = f"{journal.created_at.isoformat()}|{journal.id}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed."""
+    try:
+        created_at, journal_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(journal_id)
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(str(e))
+
 def get_user_id_from_token():
     """Extract and validate user ID from JWT token."""
     try:
@@ -22,31 +49,138 @@ def get_user_id_from_token():
 
 @journals_bp.route('/journals', methods=['GET'])
 @jwt_required()
+@conditional_on_journal_version
 def get_all_journals():
-    """Get all journals for the current user."""
+    """Get a page of journals for the current user, newest first."""
     current_user_id = get_user_id_from_token()
     if current_user_id is None:
         return jsonify({'message': 'Invalid user identity'}), HTTPStatus.UNAUTHORIZED
     
     try:
-        journals = Journal.query.filter_by(user_id=current_user_id).order_by(Journal.created_at.desc()).all()
+        limit = int(request.args.get('limit', current_app.config.get('JOURNAL_PAGE_SIZE', 50)))
+    except ValueError:
+        return jsonify({'message': 'limit must be an integer'}), HTTPStatus.BAD_REQUEST
+    limit = max(1, min(limit, current_app.config.get('JOURNAL_PAGE_MAX_SIZE', 200)))
+    
+    requested_fields = request.args.get('fields')
+    if requested_fields:
+        selected_fields = {field.strip() for field in requested_fields.split(',') if field.strip()}
+        unknown = selected_fields - JOURNAL_LIST_FIELDS
+        if unknown:
+            return jsonify({'message': f"Unknown fields: {', '.join(sorted(unknown))}"}), HTTPStatus.BAD_REQUEST
+        selected_fields.add('id')
+    else:
+        selected_fields = DEFAULT_JOURNAL_LIST_FIELDS
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'message': 'Invalid cursor'}), HTTPStatus.BAD_REQUEST
+    
+    try:
+        serializer = JournalSerializer(selected_fields)
+        statement = select(*serializer.columns).where(Journal.user_id == current_user_id)
+        if serializer.with_score:
+            statement = statement.outerjoin(JournalScore, JournalScore.journal_id == Journal.id)
+        if cursor:
+            statement = statement.where(or_(
+                Journal.created_at < cursor_created_at,
+                and_(Journal.created_at == cursor_created_at, Journal.id < cursor_id)
+            ))
         
-        response = []
-        for journal in journals:
-            journal_data = {
-                'id': journal.id,
-                'text': journal.text,
-                'created_at': journal.created_at.isoformat(),
-                'updated_at': journal.updated_at.isoformat() if hasattr(journal, 'updated_at') and journal.updated_at else None
-            }
-            
-            response.append(journal_data)
-        
-        return jsonify(response), HTTPStatus.OK
+        rows = db.session.execute(
+            statement.order_by(Journal.created_at.desc(), Journal.id.desc()).limit(limit + 1)
+        ).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        result = jsonify(serializer.many(rows))
+        if has_more:
+            result.headers['X-Next-Cursor'] = encode_cursor(rows[-1])
+        return result, HTTPStatus.OK
     except SQLAlchemyError as e:
         logging.error(f"Database error in get_all_journals: {str(e)}")
         return jsonify({'message': 'Failed to retrieve journals'}), HTTPStatus.INTERNAL_SERVER_ERROR
 
+@journals_bp.route('/journals/export', methods=['GET'])
+@jwt_required()
+def export_journals():
+    """Stream every journal of the current user with its score as NDJSON."""
+    current_user_id = get_user_id_from_token()
+    if current_user_id is None:
+        return jsonify({'message': 'Invalid user identity'}), HTTPStatus.UNAUTHORIZED
+    
+    batch_size = current_app.config.get('JOURNAL_EXPORT_BATCH_SIZE', 500)
+    serializer = JournalSerializer({'id', 'text', 'created_at', 'score'})
+    statement = (
+        select(*serializer.columns)
+        .outerjoin(JournalScore, JournalScore.journal_id == Journal.id)
+        .where(Journal.user_id == current_user_id)
+        .order_by(Journal.created_at, Journal.id)
+        .execution_options(yield_per=batch_size)
+    )
+    
+    def generate():
+        try:
+            for row in db.session.execute(statement):
+                yield json.dumps(serializer(row)) + '\n'
+        except SQLAlchemyError as e:
+            logging.error(f"Database error in export_journals: {str(e)}")
+            yield json.dumps({'error': 'export_failed', 'message': 'Failed to export journals'}) + '\n'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename=journals.ndjson'}
+    )
+
+@journals_bp.route('/journals/search', methods=['GET'])
+@jwt_required()
+def search_journals():
+    """Full-text search over the current user's journals, best match first."""
+    current_user_id = get_user_id_from_token()
+    if current_user_id is None:
+        return jsonify({'message': 'Invalid user identity'}), HTTPStatus.UNAUTHORIZED
+    
+    terms = search_terms(request.args.get('q'))
+    if not terms:
+        return jsonify({'message': 'q must contain at least one word'}), HTTPStatus.BAD_REQUEST
+    
+    try:
+        limit = int(request.args.get('limit', current_app.config.get('JOURNAL_PAGE_SIZE', 50)))
+    except ValueError:
+        return jsonify({'message': 'limit must be an integer'}), HTTPStatus.BAD_REQUEST
+    limit = max(1, min(limit, current_app.config.get('JOURNAL_PAGE_MAX_SIZE', 200)))
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor = decode_search_cursor(cursor)
+        except ValueError:
+            return jsonify({'message': 'Invalid cursor'}), HTTPStatus.BAD_REQUEST
+    
+    serializer = JournalSerializer({'id', 'text', 'created_at'})
+    try:
+        statement = search_statement(db.engine.dialect.name, serializer.columns, current_user_id,
+                                     terms, limit + 1, cursor or None)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), HTTPStatus.NOT_IMPLEMENTED
+    
+    try:
+        rows = db.session.execute(statement).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        result = jsonify(serializer.many(rows))
+        if has_more:
+            result.headers['X-Next-Cursor'] = encode_search_cursor(rows[-1])
+        return result, HTTPStatus.OK
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in search_journals: {str(e)}")
+        return jsonify({'message': 'Failed to search journals'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
 @journals_bp.route('/journals', methods=['POST'])
 @jwt_required()
 def create_journal():
@@ -72,30 +206,23 @@ def create_journal():
         journal = Journal(text=validated_data['text'], user_id=current_user_id)
         db.session.add(journal)
         db.session.flush()
+        version = bump_journal_version(current_user_id)
         
-        scores = TextAnalyzer.analyze_text(validated_data['text'])
-        
-        journal_score = JournalScore(
-            journal_id=journal.id,
-            positive_emotion=scores.get('positive_emotion', 0),
-            negative_emotion=scores.get('negative_emotion', 0),
-            social=scores.get('social', 0),
-            cognitive=scores.get('cognitive', 0),
-            total_score=scores.get('total', 0)
-        )
+        if current_app.config.get('ASYNC_SCORING', False):
+            db.session.commit()
+            current_app.extensions['scoring_queue'].submit(journal.id)
+            return jsonify({'journal_id': journal.id, 'status': 'pending'}), HTTPStatus.ACCEPTED
         
-        db.session.add(journal_score)
+        journal_score = score_journal(journal)
         db.session.commit()
         
+        score = score_payload(journal_score)
+        current_app.extensions['score_cache'].set(current_user_id, journal.id, version, score)
+        
         return jsonify({
             'journal_id': journal.id,
-            'score': {
-                'positive_emotion': journal_score.positive_emotion,
-                'negative_emotion': journal_score.negative_emotion,
-                'social': journal_score.social,
-                'cognitive': journal_score.cognitive,
-                'total': journal_score.total_score
-            }
+            'status': 'ready',
+            'score': score
         }), HTTPStatus.CREATED
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -106,68 +233,147 @@ def create_journal():
         logging.error(f"Unexpected error in create_journal: {str(e)}")
         return jsonify({'message': 'An unexpected error occurred'}), HTTPStatus.INTERNAL_SERVER_ERROR
 
+@journals_bp.route('/journals/batch', methods=['POST'])
+@jwt_required()
+def create_journals_batch():
+    """Create several journal entries in a single transaction."""
+    current_user_id = get_user_id_from_token()
+    if current_user_id is None:
+        return jsonify({'message': 'Invalid user identity'}), HTTPStatus.UNAUTHORIZED
+    
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No input data provided'}), HTTPStatus.BAD_REQUEST
+        
+        if not isinstance(data, list):
+            return jsonify({'message': 'Request body must be a list of journal entries'}), HTTPStatus.BAD_REQUEST
+        
+        max_size = current_app.config.get('JOURNAL_BATCH_MAX_SIZE', 100)
+        if len(data) > max_size:
+            return jsonify({'message': f'A batch may contain at most {max_size} journal entries'}), HTTPStatus.BAD_REQUEST
+        
+        schema = JournalSchema(many=True)
+        try:
+            validated_data = schema.load(data)
+        except ValidationError as err:
+            return jsonify({'message': 'Invalid input', 'errors': err.messages}), HTTPStatus.BAD_REQUEST
+        
+        empty = {index: ['Journal text cannot be empty'] for index, item in enumerate(validated_data) if not item['text'].strip()}
+        if empty:
+            return jsonify({'message': 'Invalid input', 'errors': empty}), HTTPStatus.BAD_REQUEST
+        
+        texts = [item['text'] for item in validated_data]
+        lexicon = get_lexicon()
+        all_scores = TextAnalyzer.analyze_texts(texts, lexicon)
+        
+        # sort_by_parameter_order would make SQLite fall back to one INSERT per
+        # row, so the RETURNING rows are matched back to the input by text.
+        # Entries with identical text have identical scores, so any pairing of
+        # duplicates is equivalent.
+        returned = defaultdict(deque)
+        for row in db.session.execute(
+            insert(Journal).returning(Journal.id, Journal.text, Journal.created_at),
+            [{'text': text, 'user_id': current_user_id} for text in texts]
+        ):
+            returned[row.text].append(row)
+        inserted = [returned[text].popleft() for text in texts]
+        journal_ids = [row.id for row in inserted]
+        all_columns = [score_columns(scores, lexicon.version) for scores in all_scores]
+        
+        db.session.execute(insert(JournalScore), [
+            {'journal_id': journal_id, **columns}
+            for journal_id, columns in zip(journal_ids, all_columns)
+        ])
+        record_scores(current_user_id, [
+            (row.created_at, columns) for row, columns in zip(inserted, all_columns)
+        ])
+        version = bump_journal_version(current_user_id)
+        db.session.commit()
+        
+        score_cache = current_app.extensions['score_cache']
+        response = []
+        for journal_id, scores in zip(journal_ids, all_scores):
+            score = analyzer_score_payload(scores)
+            score_cache.set(current_user_id, journal_id, version, score)
+            response.append({'journal_id': journal_id, 'score': score})
+        
+        return jsonify(response), HTTPStatus.CREATED
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Database error in create_journals_batch: {str(e)}")
+        return jsonify({'message': 'Failed to create journal entries'}), HTTPStatus.INTERNAL_SERVER_ERROR
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Unexpected error in create_journals_batch: {str(e)}")
+        return jsonify({'message': 'An unexpected error occurred'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
 @journals_bp.route('/journals/<int:journal_id>/score', methods=['GET'])
 @jwt_required()
+@conditional_on_journal_version
 def get_journal_score(journal_id):
     """Get score for a specific journal entry."""
     current_user_id = get_user_id_from_token()
     if current_user_id is None:
         return jsonify({'message': 'Invalid user identity'}), HTTPStatus.UNAUTHORIZED
     
+    score_cache = current_app.extensions['score_cache']
     try:
-        journal = Journal.query.filter_by(id=journal_id, user_id=current_user_id).first()
+        version = current_journal_version(current_user_id)
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in get_journal_score: {str(e)}")
+        return jsonify({'message': 'Failed to retrieve journal score'}), HTTPStatus.INTERNAL_SERVER_ERROR
+    
+    score = score_cache.get(current_user_id, journal_id, version)
+    if score is not None:
+        return jsonify({'journal_id': journal_id, 'status': 'ready', 'score': score}), HTTPStatus.OK
+    
+    try:
+        row = db.session.execute(
+            select(Journal.id, JournalScore.id.label('score_id'), *SCORE_COLUMNS)
+            .outerjoin(JournalScore, JournalScore.journal_id == Journal.id)
+            .where(Journal.id == journal_id, Journal.user_id == current_user_id)
+        ).first()
         
-        if not journal:
+        if not row:
             return jsonify({'message': 'Journal not found or unauthorized'}), HTTPStatus.NOT_FOUND
         
-        journal_score = journal.scores
+        if row.score_id is None:
+            return jsonify({'journal_id': row.id, 'status': 'pending'}), HTTPStatus.ACCEPTED
         
-        if not journal_score:
-            return jsonify({'message': 'No score available for this journal'}), HTTPStatus.NOT_FOUND
+        score = score_payload(row)
+        score_cache.set(current_user_id, journal_id, version, score)
         
         return jsonify({
-            'journal_id': journal.id,
-            'score': {
-                'positive_emotion': journal_score.positive_emotion,
-                'negative_emotion': journal_score.negative_emotion,
-                'social': journal_score.social,
-                'cognitive': journal_score.cognitive,
-                'total': journal_score.total_score
-            }
+            'journal_id': row.id,
+            'status': 'ready',
+            'score': score
         }), HTTPStatus.OK
     except SQLAlchemyError as e:
         logging.error(f"Database error in get_journal_score: {str(e)}")
         return jsonify({'message': 'Failed to retrieve journal score'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@journals_bp.route('/journals/<int:journal_id>', methods=['GET'])
+@jwt_required()
+@conditional_on_journal_version
+def get_journal(journal_id):
     """Get a specific journal entry with its score."""
     current_user_id = get_user_id_from_token()
     if current_user_id is None:
         return jsonify({'message': 'Invalid user identity'}), HTTPStatus.UNAUTHORIZED
     
     try:
-        journal = Journal.query.filter_by(id=journal_id, user_id=current_user_id).first()
+        serializer = JournalSerializer(JOURNAL_LIST_FIELDS)
+        row = db.session.execute(
+            select(*serializer.columns)
+            .outerjoin(JournalScore, JournalScore.journal_id == Journal.id)
+            .where(Journal.id == journal_id, Journal.user_id == current_user_id)
+        ).first()
         
-        if not journal:
+        if not row:
             return jsonify({'message': 'Journal not found or unauthorized'}), HTTPStatus.NOT_FOUND
         
-        journal_score = journal.scores
-        
-        response = {
-            'id': journal.id,
-            'text': journal.text,
-            'created_at': journal.created_at.isoformat(),
-            'updated_at': journal.updated_at.isoformat() if hasattr(journal, 'updated_at') and journal.updated_at else None
-        }
-        
-        if journal_score:
-            response['score'] = {
-                'positive_emotion': journal_score.positive_emotion,
-                'negative_emotion': journal_score.negative_emotion,
-                'social': journal_score.social,
-                'cognitive': journal_score.cognitive,
-                'total': journal_score.total_score
-            }
-        
-        return jsonify(response), HTTPStatus.OK
+        return jsonify(serializer(row)), HTTPStatus.OK
     except SQLAlchemyError as e:
         logging.error(f"Database error in get_journal: {str(e)}")
-        return jsonify({'message': 'Failed to retrieve journal'}), HTTPStatus.INTERNAL_SERVER_ERROR 
\ No newline at end of file
+        return jsonify({'message': 'Failed to retrieve journal'}), HTTPStatus.INTERNAL_SERVER_ERROR
@@ -0,0 +1,22 @@
+import hmac
+from flask import Blueprint, Response, current_app, request, jsonify
+from http import HTTPStatus
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def export_metrics():
+    """Expose this worker's metrics in Prometheus text format to holders of METRICS_TOKEN.
+
+    The endpoint does not exist unless METRICS_TOKEN is configured, so metrics
+    are never published by accident.
+    """
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        return jsonify({'message': 'Not found'}), HTTPStatus.NOT_FOUND
+    
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(credentials.encode(), token.encode()):
+        return jsonify({'message': 'Invalid metrics token'}), HTTPStatus.UNAUTHORIZED
+    
+    return Response(current_app.extensions['metrics'].render(), mimetype='text/plain; version=0.0.4')
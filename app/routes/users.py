@@ -0,0 +1,117 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.routes.journals import get_user_id_from_token
+from app.services.rollups import summarize, TREND_BUCKETS
+from app.services.trends import bucket_starts, score_trend
+from http import HTTPStatus
+from datetime import date, datetime, timedelta
+from sqlalchemy.exc import SQLAlchemyError
+import logging
+import re
+
+users_bp = Blueprint('users', __name__, url_prefix='/users/me')
+
+WINDOW_PATTERN = re.compile(r'^(all|day|([1-9][0-9]{0,2})d)$')
+MAX_WINDOW_DAYS = 366
+SUMMARY_CATEGORIES = ('positive_emotion', 'negative_emotion', 'social', 'cognitive')
+TREND_CATEGORIES = {**{category: category for category in SUMMARY_CATEGORIES}, 'total': 'total_score'}
+MAX_TREND_BUCKETS = 400
+MAX_TREND_WINDOW = 52
+DEFAULT_TREND_SPANS = {'day': timedelta(days=29), 'week': timedelta(weeks=11), 'month': timedelta(days=334)}
+DEFAULT_TREND_WINDOWS = {'day': 7, 'week': 4, 'month': 3}
+DATE_RANGE_MESSAGE = 'from and to must leave room for whole buckets and the moving-average window between 0001-01-01 and 9999-12-31'
+
+@users_bp.route('/score-summary', methods=['GET'])
+@jwt_required()
+def get_score_summary():
+    """Get the current user's score totals and averages over a time window."""
+    current_user_id = get_user_id_from_token()
+    if current_user_id is None:
+        return jsonify({'message': 'Invalid user identity'}), HTTPStatus.UNAUTHORIZED
+    
+    window = request.args.get('window', 'all')
+    match = WINDOW_PATTERN.match(window)
+    if not match or (match.group(2) and int(match.group(2)) > MAX_WINDOW_DAYS):
+        return jsonify({'message': f"window must be 'all', 'day' or '<n>d' with n <= {MAX_WINDOW_DAYS}"}), HTTPStatus.BAD_REQUEST
+    
+    try:
+        totals = summarize(current_user_id, window)
+        journal_count = totals['journal_count']
+        
+        totals_by_category = {category: totals[category] for category in SUMMARY_CATEGORIES}
+        totals_by_category['total'] = totals['total_score']
+        
+        return jsonify({
+            'window': window,
+            'journal_count': journal_count,
+            'totals': totals_by_category,
+            'averages': {
+                category: round(value / journal_count, 4) if journal_count else 0.0
+                for category, value in totals_by_category.items()
+            }
+        }), HTTPStatus.OK
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in get_score_summary: {str(e)}")
+        return jsonify({'message': 'Failed to retrieve score summary'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+def _series(values):
+    return [None if value != value else round(float(value), 4) for value in values]
+
+@users_bp.route('/trends', methods=['GET'])
+@jwt_required()
+def get_score_trends():
+    """Get the current user's average scores per day, week or month with moving averages."""
+    current_user_id = get_user_id_from_token()
+    if current_user_id is None:
+        return jsonify({'message': 'Invalid user identity'}), HTTPStatus.UNAUTHORIZED
+    
+    bucket = request.args.get('bucket', 'week')
+    if bucket not in TREND_BUCKETS:
+        return jsonify({'message': f"bucket must be one of: {', '.join(TREND_BUCKETS)}"}), HTTPStatus.BAD_REQUEST
+    
+    try:
+        end = date.fromisoformat(request.args['to']) if 'to' in request.args else datetime.utcnow().date()
+        start = date.fromisoformat(request.args['from']) if 'from' in request.args else end - DEFAULT_TREND_SPANS[bucket]
+    except ValueError:
+        return jsonify({'message': 'from and to must be dates in YYYY-MM-DD format'}), HTTPStatus.BAD_REQUEST
+    except OverflowError:
+        return jsonify({'message': DATE_RANGE_MESSAGE}), HTTPStatus.BAD_REQUEST
+    if start > end:
+        return jsonify({'message': 'from must not be after to'}), HTTPStatus.BAD_REQUEST
+    
+    try:
+        window = int(request.args.get('window', DEFAULT_TREND_WINDOWS[bucket]))
+    except ValueError:
+        return jsonify({'message': 'window must be an integer'}), HTTPStatus.BAD_REQUEST
+    if not 1 <= window <= MAX_TREND_WINDOW:
+        return jsonify({'message': f'window must be between 1 and {MAX_TREND_WINDOW}'}), HTTPStatus.BAD_REQUEST
+    
+    try:
+        starts = bucket_starts(start, end, bucket, limit=MAX_TREND_BUCKETS)
+    except OverflowError:
+        return jsonify({'message': DATE_RANGE_MESSAGE}), HTTPStatus.BAD_REQUEST
+    if starts is None:
+        return jsonify({'message': f'A trend may span at most {MAX_TREND_BUCKETS} buckets'}), HTTPStatus.BAD_REQUEST
+    
+    try:
+        trend = score_trend(current_user_id, bucket, starts, window)
+        
+        return jsonify({
+            'bucket': bucket,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'window': window,
+            'buckets': [first_day.isoformat() for first_day in starts],
+            'journal_count': trend['journal_count'],
+            'averages': {
+                name: _series(trend['averages'][column]) for name, column in TREND_CATEGORIES.items()
+            },
+            'moving_averages': {
+                name: _series(trend['moving_averages'][column]) for name, column in TREND_CATEGORIES.items()
+            }
+        }), HTTPStatus.OK
+    except OverflowError:
+        return jsonify({'message': DATE_RANGE_MESSAGE}), HTTPStatus.BAD_REQUEST
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in get_score_trends: {str(e)}")
+        return jsonify({'message': 'Failed to retrieve score trends'}), HTTPStatus.INTERNAL_SERVER_ERROR
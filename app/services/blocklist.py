@@ -0,0 +1,87 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete
+from app.models.token_blocklist import TokenBlocklist
+from app import db
+
+class MemoryBlocklist:
+    """Revoked token ids held only in this process; for tests and single-process deployments."""
+
+    def __init__(self, app=None):
+        self._revoked = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, jti, token_type, user_id, expires_at):
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def is_revoked(self, jti):
+        return jti in self._revoked
+
+    def prune(self, now=None):
+        now = now or datetime.utcnow()
+        with self._lock:
+            for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[jti]
+
+class DatabaseBlocklist(MemoryBlocklist):
+    """Revoked token ids cached in-process and synced from the token_blocklist table.
+
+    Checks are a set lookup. Rows written by other workers are picked up at
+    most JWT_BLOCKLIST_SYNC_INTERVAL seconds later. Each sync fetches the rows
+    created since the previous one started, minus JWT_BLOCKLIST_SYNC_OVERLAP
+    seconds: ids and timestamps are assigned before commit, so concurrent
+    revocations can become visible out of order, and a row committed up to
+    the overlap after it was created is still seen.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.sync_interval = app.config.get('JWT_BLOCKLIST_SYNC_INTERVAL', 5)
+        self.sync_overlap = timedelta(seconds=app.config.get('JWT_BLOCKLIST_SYNC_OVERLAP', 60))
+        self._synced_at = None
+        self._next_sync = 0.0
+
+    def revoke(self, jti, token_type, user_id, expires_at):
+        entry = TokenBlocklist(jti=jti, token_type=token_type, user_id=user_id, expires_at=expires_at)
+        db.session.add(entry)
+        db.session.commit()
+        super().revoke(jti, token_type, user_id, expires_at)
+
+    def is_revoked(self, jti):
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+        return super().is_revoked(jti)
+
+    def sync(self):
+        started = datetime.utcnow()
+        statement = select(TokenBlocklist.jti, TokenBlocklist.expires_at).where(TokenBlocklist.expires_at > started)
+        if self._synced_at is not None:
+            statement = statement.where(TokenBlocklist.created_at >= self._synced_at - self.sync_overlap)
+        rows = db.session.execute(statement).all()
+
+        with self._lock:
+            for row in rows:
+                self._revoked[row.jti] = row.expires_at
+            self._synced_at = started
+            self._next_sync = time.monotonic() + self.sync_interval
+        self.prune()
+
+    def purge_expired(self):
+        """Delete expired rows from the table; returns the number removed."""
+        result = db.session.execute(delete(TokenBlocklist).where(TokenBlocklist.expires_at <= datetime.utcnow()))
+        db.session.commit()
+        return result.rowcount
+
+BLOCKLIST_BACKENDS = {
+    'database': DatabaseBlocklist,
+    'memory': MemoryBlocklist
+}
+
+def create_blocklist(app):
+    backend = app.config.get('JWT_BLOCKLIST_BACKEND', 'database')
+    try:
+        return BLOCKLIST_BACKENDS[backend](app)
+    except KeyError:
+        raise ValueError(f"Unknown JWT_BLOCKLIST_BACKEND: {backend}")
@@ -0,0 +1,103 @@
+import hashlib
+import logging
+from datetime import datetime
+from functools import wraps
+from flask import g, request, make_response
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.models.journal_version import JournalVersion
+from app import db
+
+CACHE_CONTROL = 'private, no-cache'
+
+def bump_journal_version(user_id):
+    """Mark the user's journals as changed in the current transaction and return the new version."""
+    now = datetime.utcnow()
+    statement = (
+        update(JournalVersion)
+        .where(JournalVersion.user_id == user_id)
+        .values(version=JournalVersion.version + 1, updated_at=now)
+        .returning(JournalVersion.version)
+        .execution_options(synchronize_session=False)
+    )
+    version = db.session.execute(statement).scalar()
+    if version is not None:
+        return version
+
+    try:
+        with db.session.begin_nested():
+            db.session.add(JournalVersion(user_id=user_id, version=1, updated_at=now))
+        return 1
+    except IntegrityError:
+        return db.session.execute(statement).scalar()
+
+def bump_all_journal_versions():
+    """Mark every user's journals as changed, e.g. after a rescore."""
+    db.session.execute(
+        update(JournalVersion)
+        .values(version=JournalVersion.version + 1, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+def current_journal_version(user_id):
+    """The user's journal version, read at most once per request.
+
+    Score cache entries are tagged with it; it must be read before the
+    scores it tags so that a concurrent rescore can only make them unreachable.
+    """
+    cached = g.get('journal_version')
+    if cached is not None and cached[0] == user_id:
+        return cached[1]
+
+    version = db.session.scalar(select(JournalVersion.version).where(JournalVersion.user_id == user_id)) or 0
+    g.journal_version = (user_id, version)
+    return version
+
+def journal_etag(user_id):
+    """Return the ETag of the current request's representation for a user.
+
+    The tag covers the user's journal version and the request path and query,
+    so each page and projection gets its own tag. No Last-Modified is sent:
+    its one-second resolution would let a write in the same second as a
+    previous response go unnoticed, while the version changes on every write.
+    """
+    version = db.session.scalar(select(JournalVersion.version).where(JournalVersion.user_id == user_id)) or 0
+    g.journal_version = (user_id, version)
+
+    digest = hashlib.sha1(f"{user_id}:{request.full_path}".encode()).hexdigest()[:16]
+    return f"{version}-{digest}"
+
+def conditional_on_journal_version(view):
+    """Answer GETs with 304 while the user's journals are unchanged.
+
+    The ETag is checked before the view runs, so a matching If-None-Match
+    costs one primary-key lookup. 200 responses are tagged with ETag and
+    Cache-Control.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            user_id = int(get_jwt_identity())
+        except (ValueError, TypeError):
+            return view(*args, **kwargs)
+
+        try:
+            etag = journal_etag(user_id)
+        except SQLAlchemyError as e:
+            logging.error(f"Database error reading journal version: {str(e)}")
+            return view(*args, **kwargs)
+
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        response.vary.add('Authorization')
+        return response
+
+    return wrapper
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.services.cache import TTLCache
+from app import db
+
+@dataclass(frozen=True)
+class UserIdentity:
+    """The user fields authenticated routes need, detached from any session."""
+    id: int
+    username: str
+    email: str
+
+class IdentityResolver:
+    """Resolves JWT subjects to UserIdentity records through a bounded TTL cache.
+
+    With JWT_TRUST_IDENTITY_CLAIMS enabled, the username and email claims added
+    at login are trusted as-is and the user table is not read at all.
+    """
+
+    def __init__(self, app):
+        self.trust_claims = app.config.get('JWT_TRUST_IDENTITY_CLAIMS', False)
+        self.cache = TTLCache(
+            maxsize=app.config.get('USER_CACHE_SIZE', 1024),
+            ttl=app.config.get('USER_CACHE_TTL', 300)
+        )
+
+    def resolve(self, jwt_data):
+        user_id = int(jwt_data['sub'])
+
+        if self.trust_claims and 'username' in jwt_data and 'email' in jwt_data:
+            return UserIdentity(user_id, jwt_data['username'], jwt_data['email'])
+
+        identity = self.cache.get(user_id)
+        if identity is None:
+            row = db.session.query(User.id, User.username, User.email).filter_by(id=user_id).one_or_none()
+            if row is None:
+                return None
+            identity = UserIdentity(row.id, row.username, row.email)
+            self.cache.set(user_id, identity)
+
+        return identity
+
+    def invalidate(self, user_id):
+        self.cache.delete(user_id)
+
+@event.listens_for(Session, 'after_flush')
+def _track_user_changes(session, flush_context):
+    changed = {instance.id for instance in (*session.dirty, *session.deleted) if isinstance(instance, User)}
+    if changed:
+        session.info.setdefault('changed_user_ids', set()).update(changed)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    changed = session.info.pop('changed_user_ids', None)
+    if changed and has_app_context():
+        resolver = current_app.extensions.get('identity_resolver')
+        if resolver is not None:
+            for user_id in changed:
+                resolver.invalidate(user_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('changed_user_ids', None)
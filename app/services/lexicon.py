@@ -0,0 +1,304 @@
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+from flask import current_app
+from sqlalchemy import event, select, func, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models.word_category import WordCategory, Word
+from app.models.lexicon_version import LexiconVersion
+from app import db
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+# Built-in categories; they also have their own JournalScore and ScoreRollup columns.
+SCORE_CATEGORIES = ('positive_emotion', 'negative_emotion', 'social', 'cognitive')
+# Keys of analyzer output and score payloads that are not categories.
+RESERVED_NAMES = ('total', 'tokens', 'normalized')
+MAX_ENTRY_LENGTH = 50
+
+def tokenize(text):
+    """Convert text to lowercase and split into word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def weighted_words(words):
+    """Yield (word, weight) pairs from a list of words weighing 1 or a {word: weight} mapping."""
+    if isinstance(words, dict):
+        for word, weight in words.items():
+            weight = float(weight)
+            yield word.strip(), int(weight) if weight.is_integer() else weight
+    else:
+        for word in words:
+            yield word.strip(), 1
+
+def category_scores(scores):
+    """The per-category values of analyzer output, without total and token count."""
+    return {
+        name: round(value, 4) if isinstance(value, float) else value
+        for name, value in scores.items() if name not in RESERVED_NAMES
+    }
+
+class Lexicon:
+    """Compiled, read-only view of the word categories used for scoring.
+
+    Entries are tokenized like journal text. Single-token entries live in a
+    flat hash index; multi-token entries ("co-worker", "looking forward") are
+    stored in a token trie so that a text is matched in one left-to-right pass
+    whose cost depends on the text length and the longest phrase, not on the
+    size of the lexicon.
+
+    Each entry is compiled to the (category position, weight) pairs it counts
+    towards, so a match costs one update per category of the entry however
+    many categories the lexicon has. Whole-number weights are kept as ints so
+    unweighted lexicons score in exact hit counts.
+    """
+
+    def __init__(self, category_words, version=None, generation=0):
+        self.version = version
+        self.generation = generation
+        self.categories = tuple(category_words)
+
+        weights = {}
+        phrases = {}
+        for position, words in enumerate(category_words.values()):
+            for word, weight in weighted_words(words):
+                tokens = tokenize(word)
+                if not tokens:
+                    continue
+
+                key = ' '.join(tokens)
+                pairs = weights.get(key, ())
+                if all(pair[0] != position for pair in pairs):
+                    weights[key] = pairs + ((position, weight),)
+
+                if len(tokens) > 1:
+                    node = phrases
+                    for token in tokens:
+                        node = node.setdefault(token, {})
+                    node[None] = key
+
+        self.weights = weights
+        self.entries = {key: tuple(position for position, _ in pairs) for key, pairs in weights.items()}
+        self.index = {key: positions for key, positions in self.entries.items() if ' ' not in key}
+        self.phrases = phrases
+
+    def match(self, tokens):
+        """Yield the entry key of every lexicon match in tokens, preferring the longest phrase."""
+        if not self.phrases:
+            index = self.index
+            for token in tokens:
+                if token in index:
+                    yield token
+            return
+
+        index, phrases = self.index, self.phrases
+        position, length = 0, len(tokens)
+        while position < length:
+            token = tokens[position]
+            node = phrases.get(token)
+            if node is not None:
+                match_key, match_end = None, position
+                cursor = position + 1
+                while node is not None:
+                    if None in node:
+                        match_key, match_end = node[None], cursor
+                    if cursor >= length:
+                        break
+                    node = node.get(tokens[cursor])
+                    cursor += 1
+
+                if match_key is not None:
+                    yield match_key
+                    position = match_end
+                    continue
+
+            if token in index:
+                yield token
+            position += 1
+
+    def score_tokens(self, tokens):
+        """Sum weighted category hits for a list of tokens with one lookup per distinct match.
+
+        Returns the score of every category, their 'total' and the number of
+        'tokens', from which scores per 100 tokens are derived.
+        """
+        counts = [0] * len(self.categories)
+        weights = self.weights
+        matches = tokens if not self.phrases else self.match(tokens)
+
+        for key, occurrences in Counter(matches).items():
+            for position, weight in weights.get(key, ()):
+                counts[position] += occurrences * weight
+
+        scores = dict(zip(self.categories, counts))
+        scores['total'] = sum(counts)
+        scores['tokens'] = len(tokens)
+        return scores
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f'<Lexicon v{self.version} {len(self.categories)} categories, {len(self.entries)} entries>'
+
+_lock = threading.Lock()
+_generation = 0
+_lexicon = None
+_next_check = 0.0
+
+def load_category_words():
+    """Load every category with its {word: weight} mapping in a single query."""
+    rows = db.session.query(WordCategory.name, Word.word, Word.weight).outerjoin(
+        Word, Word.category_id == WordCategory.id
+    ).order_by(WordCategory.id, Word.id).all()
+
+    categories = {}
+    for category_name, word, weight in rows:
+        words = categories.setdefault(category_name, {})
+        if word is not None:
+            words[word] = weight
+
+    return categories
+
+def published_version():
+    """The id of the newest published lexicon version, or None if nothing was published."""
+    return db.session.scalar(select(func.max(LexiconVersion.id)))
+
+def load_version_words(version):
+    return db.session.get(LexiconVersion, version).words
+
+def get_lexicon():
+    """Return the process-wide compiled lexicon, recompiling it when it is stale.
+
+    The lexicon is the newest published version, or the word tables while no
+    version has been published. Other processes' publications are picked up
+    at most LEXICON_SYNC_INTERVAL seconds later. A single thread compiles the
+    replacement and swaps it in; other threads keep scoring with the lexicon
+    they have until then, and callers holding the old object are unaffected.
+    """
+    global _lexicon, _next_check
+
+    lexicon = _lexicon
+    if lexicon is not None and lexicon.generation == _generation and time.monotonic() < _next_check:
+        return lexicon
+
+    if not _lock.acquire(blocking=lexicon is None):
+        return lexicon
+    try:
+        generation = _generation
+        version = published_version()
+        _next_check = time.monotonic() + current_app.config.get('LEXICON_SYNC_INTERVAL', 5)
+        if _lexicon is None or _lexicon.generation != generation or _lexicon.version != version:
+            category_words = load_version_words(version) if version is not None else load_category_words()
+            _lexicon = Lexicon(category_words, version=version, generation=generation)
+        return _lexicon
+    finally:
+        _lock.release()
+
+def validate_category_words(category_words):
+    """Check a {category: words} mapping can be published, raising ValueError if not.
+
+    Words are a list, each weighing 1, or an object of words to weights.
+    """
+    if not isinstance(category_words, dict) or not category_words:
+        raise ValueError('categories must be a non-empty object of category names to word lists')
+
+    for category, words in category_words.items():
+        if not category.strip() or len(category) > MAX_ENTRY_LENGTH:
+            raise ValueError(f"Category names must be 1 to {MAX_ENTRY_LENGTH} characters: {category!r}")
+        if category in RESERVED_NAMES:
+            raise ValueError(f"{category} is reserved and cannot be a category name")
+        if isinstance(words, dict):
+            if not all(isinstance(weight, (int, float)) and not isinstance(weight, bool) and math.isfinite(weight)
+                       for weight in words.values()):
+                raise ValueError(f"Weights of {category} must be finite numbers")
+            words = list(words)
+        if not isinstance(words, list) or not all(isinstance(word, str) and word.strip() for word in words):
+            raise ValueError(f"Words of {category} must be a list or object of non-empty strings")
+        too_long = [word for word in words if len(word) > MAX_ENTRY_LENGTH]
+        if too_long:
+            raise ValueError(f"Words of {category} may be at most {MAX_ENTRY_LENGTH} characters: {too_long[0]}")
+
+def replace_word_lists(category_words):
+    """Make the word tables hold exactly category_words, keeping existing category rows."""
+    db.session.execute(delete(Word))
+    categories = {category.name: category for category in WordCategory.query.all()}
+    for name, category in categories.items():
+        if name not in category_words:
+            db.session.delete(category)
+
+    for name, words in category_words.items():
+        category = categories.get(name)
+        if category is None:
+            category = WordCategory(name=name)
+            db.session.add(category)
+            db.session.flush()
+        db.session.add_all(
+            Word(word=word, weight=weight, category_id=category.id)
+            for word, weight in dict(weighted_words(words)).items()
+        )
+
+def publish_lexicon(category_words=None, note=None):
+    """Publish a new lexicon version and return it.
+
+    With category_words the word tables are replaced first; without, the
+    current word tables are published as they are. Journals keep the scores
+    of the version they were scored with until they are rescored.
+    """
+    replace = category_words is not None
+    if not replace:
+        category_words = load_category_words()
+    validate_category_words(category_words)
+    category_words = {name: dict(weighted_words(words)) for name, words in category_words.items()}
+    if replace:
+        replace_word_lists(category_words)
+
+    version = LexiconVersion(words=category_words, note=note)
+    db.session.add(version)
+    db.session.commit()
+    return version
+
+def warm_lexicon(app):
+    """Compile the lexicon ahead of the first request.
+
+    Called once in the process that loads the app; with gunicorn's preload_app
+    that is the master, so forked workers share the compiled copy. A database
+    that has not been migrated yet is reported and skipped.
+    """
+    with app.app_context():
+        try:
+            return get_lexicon()
+        except SQLAlchemyError as e:
+            logging.warning(f"Lexicon warm-up skipped: {str(e)}")
+            return None
+        finally:
+            db.session.remove()
+
+def invalidate_lexicon():
+    """Bump the lexicon generation so the next lookup recompiles from the database."""
+    global _generation
+
+    with _lock:
+        _generation += 1
+
+def _touches_lexicon(session):
+    return any(
+        isinstance(instance, (WordCategory, Word, LexiconVersion))
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    )
+
+@event.listens_for(Session, 'after_flush')
+def _track_lexicon_changes(session, flush_context):
+    if _touches_lexicon(session):
+        session.info['lexicon_changed'] = True
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    if session.info.pop('lexicon_changed', False):
+        invalidate_lexicon()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('lexicon_changed', None)
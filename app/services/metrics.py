@@ -0,0 +1,195 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app, g, request, has_app_context, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+request_logger = logging.getLogger('app.requests')
+
+class Histogram:
+    """Cumulative Prometheus-style histogram keyed by a tuple of label values."""
+
+    def __init__(self, name, description, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][position] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series_items = sorted(self._series.items())
+        for labels, (bucket_counts, total, count) in series_items:
+            pairs = [f'{name}="{value}"' for name, value in zip(self.label_names, labels)]
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                lines.append(f'{self.name}_bucket{_labels(pairs, bound)} {bucket_count}')
+            lines.append(f'{self.name}_bucket{_labels(pairs, "+Inf")} {count}')
+            lines.append(f'{self.name}_sum{_labels(pairs)} {total}')
+            lines.append(f'{self.name}_count{_labels(pairs)} {count}')
+        return lines
+
+def _labels(pairs, bound=None):
+    if bound is not None:
+        pairs = pairs + [f'le="{bound}"']
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class Metrics:
+    """Per-process request, SQL and analyzer metrics, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', 'Request latency by route.',
+            ('blueprint', 'endpoint', 'method', 'status')
+        )
+        self.request_queries = Histogram(
+            'http_request_sql_queries', 'SQL statements executed per request.',
+            ('endpoint',), QUERY_COUNT_BUCKETS
+        )
+        self.sql_duration = Histogram('sql_query_duration_seconds', 'Duration of individual SQL statements.')
+        self.analyzer_duration = Histogram('analyzer_duration_seconds', 'Time spent tokenizing and scoring text.')
+        self._collectors = []
+
+    def register_collector(self, collector):
+        """Add a callable returning extra exposition lines, e.g. cache counters."""
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for histogram in (self.request_duration, self.request_queries, self.sql_duration, self.analyzer_duration):
+            lines.extend(histogram.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+def cache_lines(name, cache):
+    """Exposition lines for the hit, miss and, if the cache is sized, size counters of a cache."""
+    lines = [
+        f'# HELP {name}_hits_total Lookups answered from {name}.', f'# TYPE {name}_hits_total counter',
+        f'{name}_hits_total {cache.hits}',
+        f'# HELP {name}_misses_total Lookups not found in {name}.', f'# TYPE {name}_misses_total counter',
+        f'{name}_misses_total {cache.misses}'
+    ]
+    if hasattr(cache, '__len__'):
+        lines += [
+            f'# HELP {name}_entries Entries currently held in {name}.', f'# TYPE {name}_entries gauge',
+            f'{name}_entries {len(cache)}'
+        ]
+    return lines
+
+def _current_metrics():
+    if has_app_context():
+        return current_app.extensions.get('metrics')
+    return None
+
+@contextmanager
+def analyzer_timer():
+    """Time a block of analyzer work for the current app and request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current_metrics()
+        if metrics is not None:
+            elapsed = time.perf_counter() - started
+            metrics.analyzer_duration.observe(elapsed)
+            if has_request_context():
+                g.analyzer_seconds = g.get('analyzer_seconds', 0.0) + elapsed
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stack = conn.info.get('query_started')
+    if not stack:
+        return
+    started = stack.pop()
+    metrics = _current_metrics()
+    if metrics is None:
+        return
+
+    elapsed = time.perf_counter() - started
+    metrics.sql_duration.observe(elapsed)
+    if has_request_context():
+        g.sql_queries = g.get('sql_queries', 0) + 1
+        g.sql_seconds = g.get('sql_seconds', 0.0) + elapsed
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_started'):
+        connection.info['query_started'].pop()
+
+_engine_events_installed = False
+
+def _install_engine_events():
+    global _engine_events_installed
+    if not _engine_events_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+        _engine_events_installed = True
+
+def init_app(app):
+    """Install request timing, SQL statement counting and the JSON request log."""
+    metrics = Metrics()
+    app.extensions['metrics'] = metrics
+    _install_engine_events()
+
+    if app.config.get('REQUEST_LOGGING', False) and not request_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        request_logger.addHandler(handler)
+        request_logger.setLevel(logging.INFO)
+        request_logger.propagate = False
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('request_started', None)
+        if started is None or request.endpoint in (None, 'metrics.export_metrics', 'static'):
+            return response
+
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint
+        queries = g.get('sql_queries', 0)
+        metrics.request_duration.observe(
+            elapsed, (request.blueprint or '', endpoint, request.method, str(response.status_code))
+        )
+        metrics.request_queries.observe(queries, (endpoint,))
+
+        if request_logger.isEnabledFor(logging.INFO):
+            request_logger.info(json.dumps({
+                'event': 'request',
+                'method': request.method,
+                'path': request.path,
+                'endpoint': endpoint,
+                'status': response.status_code,
+                'duration_ms': round(elapsed * 1000, 3),
+                'sql_queries': queries,
+                'sql_ms': round(g.get('sql_seconds', 0.0) * 1000, 3),
+                'analyzer_ms': round(g.get('analyzer_seconds', 0.0) * 1000, 3)
+            }))
+        return response
+
+    return metrics
@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+DEFAULT_HASH_METHOD = 'pbkdf2:sha256:600000'
+
+def _exit_with_parent(parent_pid):
+    # Runs in each pool process: a worker killed without shutting its pool
+    # down must not leave hashing processes behind.
+    def watch():
+        while os.getppid() == parent_pid:
+            time.sleep(1)
+        os._exit(0)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+def hash_prefix(method):
+    """The parameter prefix werkzeug writes for hashes made with method, e.g. 'pbkdf2:sha256:600000'.
+
+    Aliases resolve to werkzeug's defaults, as in generate_password_hash,
+    without computing a hash.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        n, r, p = map(int, args) if args else (2 ** 15, 8, 1)
+        return f'scrypt:{n}:{r}:{p}'
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    return method
+
+class HasherBusy(Exception):
+    """Raised when too many hash operations are already queued."""
+
+class PasswordHasher:
+    """Hashes and verifies passwords with configurable parameters.
+
+    With PASSWORD_HASH_WORKERS > 0 the work runs in a process pool owned by
+    this server worker, so every gunicorn worker starts its own pool: hashing
+    can use GUNICORN_WORKERS x PASSWORD_HASH_WORKERS processes in total. The
+    calling thread still waits for the result, so the pool only frees request
+    capacity with threaded (gthread) workers. At most
+    PASSWORD_HASH_MAX_PENDING operations may be queued per server worker;
+    beyond that HasherBusy is raised so callers can shed load.
+    """
+
+    def __init__(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+        self.prefix = hash_prefix(self.method)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        self._slots = threading.BoundedSemaphore(app.config.get('PASSWORD_HASH_MAX_PENDING', max(self.workers, 1) * 8))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was produced with different parameters than the configured ones."""
+        return password_hash.split('$', 1)[0] != self.prefix
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _run(self, function, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy()
+        try:
+            if self.workers <= 0:
+                return function(*args)
+            return self._pool().submit(function, *args).result(timeout=self.timeout)
+        finally:
+            self._slots.release()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_exit_with_parent, initargs=(os.getpid(),)
+                )
+            return self._executor
@@ -0,0 +1,105 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import update, delete
+from sqlalchemy.exc import IntegrityError
+from app.models.journal import Journal, JournalScore
+from app.models.score_rollup import ScoreRollup, ALL_TIME
+from app import db
+
+ROLLUP_COLUMNS = ('positive_emotion', 'negative_emotion', 'social', 'cognitive', 'total_score')
+
+TREND_BUCKETS = ('day', 'week', 'month')
+
+def bucket_start(day, bucket):
+    """The first day of the day, week (starting Monday) or month bucket containing day."""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+def _rollup_keys(created_at):
+    day = created_at.date()
+    return (('all', ALL_TIME),) + tuple((bucket, bucket_start(day, bucket)) for bucket in TREND_BUCKETS)
+
+def _accumulate(deltas, created_at, columns, prefix=()):
+    for key in _rollup_keys(created_at):
+        delta = deltas[prefix + key]
+        delta['journal_count'] += 1
+        for column in ROLLUP_COLUMNS:
+            delta[column] += columns.get(column, 0) or 0
+
+def record_scores(user_id, entries):
+    """Add (created_at, score columns) entries to the user's daily and all-time rollups.
+
+    Counters are incremented in SQL so concurrent writers do not lose updates.
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    for created_at, columns in entries:
+        _accumulate(deltas, created_at, columns)
+
+    for (period, period_start), delta in deltas.items():
+        _apply_delta(user_id, period, period_start, delta)
+
+def _apply_delta(user_id, period, period_start, delta):
+    statement = (
+        update(ScoreRollup)
+        .where(ScoreRollup.user_id == user_id,
+               ScoreRollup.period == period,
+               ScoreRollup.period_start == period_start)
+        .values({column: getattr(ScoreRollup, column) + value for column, value in delta.items()})
+        .execution_options(synchronize_session=False)
+    )
+    if db.session.execute(statement).rowcount:
+        return
+
+    try:
+        with db.session.begin_nested():
+            db.session.add(ScoreRollup(user_id=user_id, period=period, period_start=period_start, **delta))
+    except IntegrityError:
+        db.session.execute(statement)
+
+def rebuild_rollups(user_id=None, batch_size=1000):
+    """Recompute rollups from the journal_score table, for one user or everyone."""
+    query = db.session.query(
+        Journal.user_id, Journal.created_at,
+        *(getattr(JournalScore, column) for column in ROLLUP_COLUMNS)
+    ).join(JournalScore, JournalScore.journal_id == Journal.id)
+    if user_id is not None:
+        query = query.filter(Journal.user_id == user_id)
+
+    deltas = defaultdict(lambda: defaultdict(int))
+    for row in query.yield_per(batch_size):
+        _accumulate(deltas, row.created_at, dict(zip(ROLLUP_COLUMNS, row[2:])), prefix=(row.user_id,))
+
+    clear = delete(ScoreRollup)
+    if user_id is not None:
+        clear = clear.where(ScoreRollup.user_id == user_id)
+    db.session.execute(clear)
+
+    db.session.add_all(
+        ScoreRollup(user_id=rollup_user_id, period=period, period_start=period_start, **delta)
+        for (rollup_user_id, period, period_start), delta in deltas.items()
+    )
+    return len(deltas)
+
+def summarize(user_id, window, today=None):
+    """Sum the rollups covering a window: 'all', 'day' or '<n>d' (the last n days)."""
+    if window == 'all':
+        rows = ScoreRollup.query.filter_by(user_id=user_id, period='all').all()
+    else:
+        days = 1 if window == 'day' else int(window[:-1])
+        today = today or datetime.utcnow().date()
+        rows = ScoreRollup.query.filter(
+            ScoreRollup.user_id == user_id,
+            ScoreRollup.period == 'day',
+            ScoreRollup.period_start > today - timedelta(days=days),
+            ScoreRollup.period_start <= today
+        ).all()
+
+    totals = dict.fromkeys(('journal_count',) + ROLLUP_COLUMNS, 0)
+    for row in rows:
+        for column in totals:
+            totals[column] += getattr(row, column)
+
+    return totals
@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+from app.services.cache import TTLCache
+
+class MemoryScoreCache:
+    """Journal scores held in a bounded in-process LRU, keyed by (user_id, journal_id, version).
+
+    version is the user's journal version from the database, which every
+    write of the user's journals and every rescore increments. Readers look
+    up the version they just read, so entries cached by any worker before a
+    rescore are never served after it; they are evicted or expire after
+    SCORE_CACHE_TTL seconds.
+    """
+
+    def __init__(self, app):
+        self._cache = TTLCache(
+            maxsize=app.config.get('SCORE_CACHE_SIZE', 10000),
+            ttl=app.config.get('SCORE_CACHE_TTL', 3600)
+        )
+
+    @property
+    def hits(self):
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        return self._cache.misses
+
+    def get(self, user_id, journal_id, version):
+        return self._cache.get((user_id, journal_id, version))
+
+    def set(self, user_id, journal_id, version, score):
+        self._cache.set((user_id, journal_id, version), score)
+
+    def invalidate(self, user_id, journal_id, version):
+        self._cache.delete((user_id, journal_id, version))
+
+    def clear(self):
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+class LocalKeyValueStore:
+    """In-process stand-in for the subset of the Redis client used by SharedScoreCache."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[name]
+                return None
+            return value
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = (str(value).encode(), self._clock() + ex if ex else None)
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def incr(self, name):
+        with self._lock:
+            value = int(self._data.get(name, (b'0', None))[0]) + 1
+            self._data[name] = (str(value).encode(), None)
+            return value
+
+class SharedScoreCache:
+    """Journal scores in a key-value store shared by every worker, such as Redis.
+
+    Keys carry the user's journal version, as in MemoryScoreCache, and a
+    generation number that clear() increments; old keys expire on their own.
+    Hit and miss counters are per process.
+    """
+
+    GENERATION_KEY = 'score_cache:generation'
+
+    def __init__(self, app, client=None):
+        self.ttl = app.config.get('SCORE_CACHE_TTL', 3600)
+        self.client = client if client is not None else _redis_client(app)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, user_id, journal_id, version):
+        generation = int(self.client.get(self.GENERATION_KEY) or 0)
+        return f'score_cache:{generation}:{user_id}:{journal_id}:{version}'
+
+    def get(self, user_id, journal_id, version):
+        value = self.client.get(self._key(user_id, journal_id, version))
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, user_id, journal_id, version, score):
+        self.client.set(self._key(user_id, journal_id, version), json.dumps(score), ex=self.ttl)
+
+    def invalidate(self, user_id, journal_id, version):
+        self.client.delete(self._key(user_id, journal_id, version))
+
+    def clear(self):
+        self.client.incr(self.GENERATION_KEY)
+
+def _redis_client(app):
+    url = app.config.get('SCORE_CACHE_URL')
+    if not url:
+        raise ValueError("SCORE_CACHE_URL is required for the 'redis' score cache backend")
+    try:
+        import redis
+    except ImportError:
+        raise ValueError("The 'redis' score cache backend requires the redis package")
+    return redis.Redis.from_url(url)
+
+SCORE_CACHE_BACKENDS = {
+    'memory': MemoryScoreCache,
+    'redis': SharedScoreCache,
+    'local': lambda app: SharedScoreCache(app, client=LocalKeyValueStore())
+}
+
+def create_score_cache(app):
+    backend = app.config.get('SCORE_CACHE_BACKEND', 'memory')
+    try:
+        return SCORE_CACHE_BACKENDS[backend](app)
+    except KeyError:
+        raise ValueError(f"Unknown SCORE_CACHE_BACKEND: {backend}")
@@ -0,0 +1,166 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.journal import Journal, JournalScore
+from app.services.text_analyzer import TextAnalyzer
+from app.services.lexicon import SCORE_CATEGORIES, get_lexicon, category_scores
+from app.services.rollups import record_scores
+from app.services.http_cache import bump_journal_version
+from app.services.serialization import score_payload
+from app import db
+
+def round_half_up(value):
+    """Round to a whole number with halves away from zero, unlike round()'s half-to-even."""
+    return int(Decimal(str(value)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def score_columns(scores, lexicon_version=None):
+    """Map analyzer output of the given lexicon version onto JournalScore column values.
+
+    Every category goes into category_scores. The built-in category columns,
+    which feed the rollups, hold their values rounded half up to whole hits,
+    and total_score is their sum, so rollup totals equal the sum of the
+    rollup categories; custom categories count only in category_scores.
+    """
+    categories = category_scores(scores)
+    columns = {category: round_half_up(categories.get(category, 0)) for category in SCORE_CATEGORIES}
+    return {
+        'lexicon_version': lexicon_version,
+        'category_scores': categories,
+        'token_count': scores.get('tokens'),
+        **columns,
+        'total_score': sum(columns.values())
+    }
+
+def score_journal(journal):
+    """Analyze a journal, add its JournalScore to the session and update the user's rollups."""
+    lexicon = get_lexicon()
+    columns = score_columns(TextAnalyzer.analyze_text(journal.text, lexicon), lexicon.version)
+    journal_score = JournalScore(journal_id=journal.id, **columns)
+    db.session.add(journal_score)
+    record_scores(journal.user_id, [(journal.created_at, columns)])
+    return journal_score
+
+class ScoringQueue:
+    """Scores persisted journals on a local thread pool, outside the request.
+
+    Jobs live only in this process, so journals queued when a worker exits,
+    and journals whose job failed, are left without a score. With
+    ASYNC_SCORING, a sweeper thread started by the first request of each
+    worker requeues journals that have been unscored for SCORING_RETRY_AFTER
+    seconds, every SCORING_SWEEP_INTERVAL seconds. A journal is given up on
+    after SCORING_MAX_ATTEMPTS failed jobs in this process.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.max_workers = app.config.get('SCORING_WORKERS', 4)
+        self.sweep_interval = app.config.get('SCORING_SWEEP_INTERVAL', 60)
+        self.retry_after = app.config.get('SCORING_RETRY_AFTER', 60)
+        self.max_attempts = app.config.get('SCORING_MAX_ATTEMPTS', 3)
+        self._executor = None
+        self._futures = set()
+        self._queued = set()
+        self._failures = {}
+        self._sweeper = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        app.before_request(self.start_sweeper)
+
+    def submit(self, journal_id):
+        """Queue a journal for scoring and return the Future of the job."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scoring')
+            future = self._executor.submit(self._score, journal_id)
+            self._futures.add(future)
+            self._queued.add(journal_id)
+
+        future.add_done_callback(lambda future: self._discard(future, journal_id))
+        return future
+
+    def sweep(self):
+        """Queue the journals left unscored for SCORING_RETRY_AFTER seconds; returns how many."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retry_after)
+        with self.app.app_context():
+            try:
+                journal_ids = db.session.scalars(
+                    select(Journal.id)
+                    .outerjoin(JournalScore, JournalScore.journal_id == Journal.id)
+                    .where(JournalScore.id.is_(None), Journal.created_at <= cutoff)
+                    .order_by(Journal.id)
+                    .limit(self.max_workers * 100)
+                ).all()
+            finally:
+                db.session.remove()
+
+        with self._lock:
+            journal_ids = [
+                journal_id for journal_id in journal_ids
+                if journal_id not in self._queued and self._failures.get(journal_id, 0) < self.max_attempts
+            ]
+        for journal_id in journal_ids:
+            self.submit(journal_id)
+        return len(journal_ids)
+
+    def start_sweeper(self):
+        """Start this process's sweeper thread if async scoring is enabled and it is not running."""
+        if self._sweeper is not None or not self.app.config.get('ASYNC_SCORING', False):
+            return
+        with self._lock:
+            if self._sweeper is not None or self._stopped.is_set():
+                return
+            self._sweeper = threading.Thread(target=self._sweep_periodically, name='scoring-sweeper', daemon=True)
+            self._sweeper.start()
+
+    def _sweep_periodically(self):
+        while not self._stopped.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logging.error(f"Error sweeping unscored journals: {str(e)}")
+
+    def join(self, timeout=None):
+        """Wait for every queued job to finish."""
+        with self._lock:
+            futures = set(self._futures)
+        wait(futures, timeout=timeout)
+
+    def shutdown(self, wait=True):
+        self._stopped.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _discard(self, future, journal_id):
+        with self._lock:
+            self._futures.discard(future)
+            self._queued.discard(journal_id)
+            if future.result():
+                self._failures.pop(journal_id, None)
+            else:
+                self._failures[journal_id] = self._failures.get(journal_id, 0) + 1
+
+    def _score(self, journal_id):
+        """Score one journal; returns False if the job failed."""
+        with self.app.app_context():
+            try:
+                journal = db.session.get(Journal, journal_id)
+                if journal is None or journal.scores is not None:
+                    return True
+                journal_score = score_journal(journal)
+                version = bump_journal_version(journal.user_id)
+                db.session.commit()
+                self.app.extensions['score_cache'].set(journal.user_id, journal.id, version, score_payload(journal_score))
+                return True
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                logging.error(f"Database error scoring journal {journal_id}: {str(e)}")
+            except Exception as e:
+                db.session.rollback()
+                logging.error(f"Unexpected error scoring journal {journal_id}: {str(e)}")
+            return False
@@ -0,0 +1,73 @@
+import base64
+import binascii
+from sqlalchemy import select, func, literal_column, table, column, or_, and_
+from app.models.journal import Journal
+from app.services.lexicon import tokenize
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = literal_column('journal_fts')
+journal_fts = table('journal_fts', column('rowid'))
+
+def search_terms(query):
+    """Split a search query into the word tokens journals are indexed by."""
+    return tokenize(query or '')
+
+def encode_search_cursor(row):
+    """Encode the (rank, id) position of a search result as an opaque cursor."""
+    position = f"{row.rank!r}|{row.id}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+def decode_search_cursor(cursor):
+    """Decode a cursor produced by encode_search_cursor, raising ValueError if malformed."""
+    try:
+        rank, journal_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return float(rank), int(journal_id)
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(str(e))
+
+def _sqlite_search(columns, user_id, terms):
+    # Terms are \w+ tokens, so quoting them keeps FTS5 query syntax out of user input.
+    phrases = ' AND '.join(f'"{term}"' for term in terms)
+    match = f'user_id : "{user_id}" AND text : ({phrases})'
+    rank = func.bm25(FTS_TABLE, 1.0, 0.0)
+    statement = (
+        select(*columns, rank.label('rank'))
+        .select_from(journal_fts)
+        .join(Journal, Journal.id == journal_fts.c.rowid)
+        .where(FTS_TABLE.op('MATCH')(match), Journal.user_id == user_id)
+    )
+    return statement, rank
+
+def _postgresql_search(columns, user_id, terms):
+    document = func.to_tsvector(SEARCH_CONFIG, Journal.text)
+    query = func.plainto_tsquery(SEARCH_CONFIG, ' '.join(terms))
+    # Negated so that, as with bm25, better matches sort first in ascending order.
+    rank = -func.ts_rank(document, query)
+    statement = (
+        select(*columns, rank.label('rank'))
+        .where(Journal.user_id == user_id, document.op('@@')(query))
+    )
+    return statement, rank
+
+SEARCH_BACKENDS = {
+    'sqlite': _sqlite_search,
+    'postgresql': _postgresql_search
+}
+
+def search_statement(dialect, columns, user_id, terms, limit, cursor=None):
+    """Build a ranked full-text search over one user's journals.
+
+    Results are ordered best match first, then newest id, and paged by keyset
+    on (rank, id). Ranks depend on the whole index, so entries written between
+    two page requests can shift the boundary of the next page.
+    """
+    try:
+        build = SEARCH_BACKENDS[dialect]
+    except KeyError:
+        raise ValueError(f"Full-text search is not supported on {dialect}")
+
+    statement, rank = build(columns, user_id, terms)
+    if cursor is not None:
+        cursor_rank, cursor_id = cursor
+        statement = statement.where(or_(rank > cursor_rank, and_(rank == cursor_rank, Journal.id < cursor_id)))
+    return statement.order_by(rank, Journal.id.desc()).limit(limit)
@@ -0,0 +1,120 @@
+from flask.json.provider import DefaultJSONProvider
+from app.models.journal import Journal, JournalScore
+from app.services.lexicon import SCORE_CATEGORIES, category_scores
+
+SCORE_COLUMNS = (
+    JournalScore.category_scores, JournalScore.token_count,
+    JournalScore.positive_emotion, JournalScore.negative_emotion,
+    JournalScore.social, JournalScore.cognitive, JournalScore.total_score
+)
+
+def _score_payload(categories, total, token_count):
+    """Category scores, their total, the same per 100 tokens under 'normalized', and 'tokens'."""
+    payload = {**categories, 'total': total}
+    normalized = None
+    if token_count is not None:
+        normalized = {name: round(value * 100 / token_count, 4) if token_count else 0.0 for name, value in payload.items()}
+    payload['normalized'] = normalized
+    payload['tokens'] = token_count
+    return payload
+
+def score_payload(journal_score):
+    """The API representation of a JournalScore row, or of a result row carrying SCORE_COLUMNS.
+
+    Scores stored before category_scores existed only have the built-in
+    categories and no token count, so their 'normalized' is None until the
+    journal is rescored.
+    """
+    categories = journal_score.category_scores
+    if categories is None:
+        categories = {name: getattr(journal_score, name) for name in SCORE_CATEGORIES}
+        return _score_payload(categories, journal_score.total_score, None)
+    return _score_payload(categories, round(sum(categories.values()), 4), journal_score.token_count)
+
+def analyzer_score_payload(scores):
+    """The API representation of TextAnalyzer output that has not been stored yet."""
+    categories = category_scores(scores)
+    return _score_payload(categories, round(sum(categories.values()), 4), scores.get('tokens'))
+
+# Journals have no updated_at column; the key is kept for API compatibility.
+JOURNAL_FIELDS = {
+    'id': ((Journal.id,), lambda row: row.id),
+    'text': ((Journal.text,), lambda row: row.text),
+    'created_at': ((Journal.created_at,), lambda row: row.created_at.isoformat()),
+    'updated_at': ((), lambda row: None),
+    'score': (SCORE_COLUMNS, lambda row: score_payload(row) if row.total_score is not None else None)
+}
+JOURNAL_FIELD_ORDER = ('id', 'text', 'created_at', 'updated_at', 'score')
+
+class JournalSerializer:
+    """Turns journal result rows into API dicts for a fixed set of fields.
+
+    The field list is resolved once, so serializing a page costs one dict per
+    row. Rows come from select(*serializer.columns) rather than ORM entities;
+    an outer join on JournalScore is needed when 'score' is selected.
+    """
+
+    def __init__(self, fields):
+        names = [name for name in JOURNAL_FIELD_ORDER if name in fields]
+        columns = {'id': Journal.id, 'created_at': Journal.created_at}
+        for name in names:
+            for column in JOURNAL_FIELDS[name][0]:
+                columns.setdefault(column.key, column)
+        self.columns = list(columns.values())
+        self.with_score = 'score' in fields
+        self._getters = [(name, JOURNAL_FIELDS[name][1]) for name in names]
+
+    def __call__(self, row):
+        return {name: getter(row) for name, getter in self._getters}
+
+    def many(self, rows):
+        return [self(row) for row in rows]
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Output matches the default provider: keys are sorted when sort_keys is
+    set and dates, decimals and UUIDs go through DefaultJSONProvider.default.
+    Non-ASCII text is written as UTF-8 instead of being escaped, and responses
+    are written as bytes without an intermediate str.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        import orjson
+        self._orjson = orjson
+
+    def _options(self):
+        options = self._orjson.OPT_NON_STR_KEYS | self._orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= self._orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj, **kwargs):
+        return self._orjson.dumps(obj, default=kwargs.get('default', self.default), option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        return self._orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self._orjson.dumps(obj, default=self.default, option=self._options())
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def _orjson_provider(app):
+    try:
+        return ORJSONProvider(app)
+    except ImportError:
+        raise ValueError("The 'orjson' JSON provider requires the orjson package")
+
+JSON_PROVIDERS = {
+    'default': DefaultJSONProvider,
+    'orjson': _orjson_provider
+}
+
+def create_json_provider(app):
+    provider = app.config.get('JSON_PROVIDER', 'default')
+    try:
+        return JSON_PROVIDERS[provider](app)
+    except KeyError:
+        raise ValueError(f"Unknown JSON_PROVIDER: {provider}")
@@ -1,40 +1,27 @@
-import re
-from app.models.word_category import WordCategory, Word
-from app import db
+from app.services.lexicon import get_lexicon, load_category_words, tokenize
+from app.services.metrics import analyzer_timer
 
 class TextAnalyzer:
     @staticmethod
     def tokenize_text(text):
         """Convert text to lowercase and split into words."""
-        text = text.lower()
-        words = re.findall(r'\b\w+\b', text)
-        return words
+        return tokenize(text)
     
     @staticmethod
     def get_category_words():
         """Get all words by category from the database."""
-        categories = {}
-        word_categories = WordCategory.query.all()
-        
-        for category in word_categories:
-            categories[category.name] = [word.word for word in category.words]
-        
-        return categories
+        return load_category_words()
     
     @staticmethod
-    def analyze_text(text):
+    def analyze_text(text, lexicon=None):
         """Analyze text and return scores by category."""
-        words = TextAnalyzer.tokenize_text(text)
-        category_words = TextAnalyzer.get_category_words()
-        
-        scores = {category: 0 for category in category_words}
-        
-        for word in words:
-            for category, category_word_list in category_words.items():
-                if word in category_word_list:
-                    scores[category] += 1
-        
-        total_score = sum(scores.values())
-        scores['total'] = total_score
-        
-        return scores 
\ No newline at end of file
+        with analyzer_timer():
+            words = TextAnalyzer.tokenize_text(text)
+            return (lexicon or get_lexicon()).score_tokens(words)
+    
+    @staticmethod
+    def analyze_texts(texts, lexicon=None):
+        """Analyze several texts against a single lexicon snapshot."""
+        with analyzer_timer():
+            lexicon = lexicon or get_lexicon()
+            return [lexicon.score_tokens(TextAnalyzer.tokenize_text(text)) for text in texts]
@@ -0,0 +1,77 @@
+from datetime import timedelta
+import numpy as np
+from sqlalchemy import select
+from app.models.score_rollup import ScoreRollup
+from app.services.rollups import ROLLUP_COLUMNS, bucket_start
+from app import db
+
+def next_bucket(start, bucket):
+    """The start of the bucket following the one that starts on start."""
+    if bucket == 'day':
+        return start + timedelta(days=1)
+    if bucket == 'week':
+        return start + timedelta(weeks=1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+def previous_bucket(start, bucket):
+    """The start of the bucket preceding the one that starts on start."""
+    return bucket_start(start - timedelta(days=1), bucket)
+
+def bucket_starts(start, end, bucket, limit=None):
+    """Start dates of the buckets covering start..end, or None if there are more than limit."""
+    starts = []
+    current, last = bucket_start(start, bucket), bucket_start(end, bucket)
+    while current <= last:
+        if limit is not None and len(starts) == limit:
+            return None
+        starts.append(current)
+        current = next_bucket(current, bucket)
+    return starts
+
+def score_trend(user_id, bucket, starts, window):
+    """Average scores per bucket and their moving average over window buckets.
+
+    Reads one rollup row per bucket, plus the window - 1 buckets before the
+    first so the first moving averages are complete; the cost depends on the
+    number of buckets, not on how many journals the user has. Averages are
+    journal-weighted: a moving average is the sum of the scores in the window
+    divided by the number of journals in it. Buckets without journals have a
+    count of 0 and NaN averages.
+    """
+    lead = []
+    for _ in range(window - 1):
+        lead.insert(0, previous_bucket(lead[0] if lead else starts[0], bucket))
+    all_starts = lead + starts
+
+    rows = db.session.execute(
+        select(ScoreRollup.period_start, ScoreRollup.journal_count,
+               *(getattr(ScoreRollup, column) for column in ROLLUP_COLUMNS))
+        .where(ScoreRollup.user_id == user_id,
+               ScoreRollup.period == bucket,
+               ScoreRollup.period_start >= all_starts[0],
+               ScoreRollup.period_start <= all_starts[-1])
+    ).all()
+
+    position = {start: index for index, start in enumerate(all_starts)}
+    counts = np.zeros(len(all_starts))
+    totals = np.zeros((len(all_starts), len(ROLLUP_COLUMNS)))
+    for row in rows:
+        index = position[row.period_start]
+        counts[index] = row.journal_count
+        totals[index] = row[2:]
+
+    count_sums = np.concatenate(([0.0], np.cumsum(counts)))
+    total_sums = np.vstack((np.zeros(len(ROLLUP_COLUMNS)), np.cumsum(totals, axis=0)))
+    window_counts = count_sums[window:] - count_sums[:-window]
+    window_totals = total_sums[window:] - total_sums[:-window]
+
+    counts, totals = counts[len(lead):], totals[len(lead):]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        averages = np.where(counts[:, None] > 0, totals / counts[:, None], np.nan)
+        moving_averages = np.where(window_counts[:, None] > 0, window_totals / window_counts[:, None], np.nan)
+
+    return {
+        'journal_count': counts.astype(int).tolist(),
+        'averages': dict(zip(ROLLUP_COLUMNS, averages.T)),
+        'moving_averages': dict(zip(ROLLUP_COLUMNS, moving_averages.T))
+    }
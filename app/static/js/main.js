@@ -2,21 +2,26 @@ document.addEventListener('DOMContentLoaded', () => {
     const config = {
         apiEndpoints: {
             login: '/login',
+            logout: '/logout',
+            refresh: '/token/refresh',
             users: '/users',
             journals: '/journals',
             journalScore: (id) => `/journals/${id}/score`
         },
         storage: {
             tokenKey: 'jwt_token',
+            refreshTokenKey: 'jwt_refresh_token',
             userKey: 'user'
         }
     };
 
     const state = {
         token: null,
+        refreshToken: null,
         user: {},
         init() {
             this.token = localStorage.getItem(config.storage.tokenKey);
+            this.refreshToken = localStorage.getItem(config.storage.refreshTokenKey);
             try {
                 this.user = JSON.parse(localStorage.getItem(config.storage.userKey) || '{}');
             } catch (e) {
@@ -24,16 +29,26 @@ document.addEventListener('DOMContentLoaded', () => {
                 this.user = {};
             }
         },
-        setAuth(token, user) {
+        setAuth(token, user, refreshToken = null) {
             this.token = token;
             this.user = user;
             localStorage.setItem(config.storage.tokenKey, token);
             localStorage.setItem(config.storage.userKey, JSON.stringify(user));
+            if (refreshToken) {
+                this.refreshToken = refreshToken;
+                localStorage.setItem(config.storage.refreshTokenKey, refreshToken);
+            }
+        },
+        setAccessToken(token) {
+            this.token = token;
+            localStorage.setItem(config.storage.tokenKey, token);
         },
         clearAuth() {
             this.token = null;
+            this.refreshToken = null;
             this.user = {};
             localStorage.removeItem(config.storage.tokenKey);
+            localStorage.removeItem(config.storage.refreshTokenKey);
             localStorage.removeItem(config.storage.userKey);
         },
         isAuthenticated() {
@@ -56,7 +71,7 @@ document.addEventListener('DOMContentLoaded', () => {
     };
 
     const api = {
-        async request(url, method = 'GET', data = null, requiresAuth = false) {
+        async request(url, method = 'GET', data = null, requiresAuth = false, retried = false) {
             try {
                 const headers = {
                     'Content-Type': 'application/json'
@@ -88,7 +103,10 @@ document.addEventListener('DOMContentLoaded', () => {
                 }
                 
                 if (response.status === 401 && requiresAuth) {
-                    if (responseData.error === 'token_expired' || responseData.error === 'invalid_token') {
+                    if (responseData.error === 'token_expired' && !retried && await this.refresh()) {
+                        return await this.request(url, method, data, requiresAuth, true);
+                    }
+                    if (['token_expired', 'invalid_token', 'token_revoked'].includes(responseData.error)) {
                         ui.showNotification('Session expired. Please log in again.', 'error');
                         state.clearAuth();
                         ui.updateLoginStatus();
@@ -98,7 +116,8 @@ document.addEventListener('DOMContentLoaded', () => {
                 return {
                     ok: response.ok,
                     status: response.status,
-                    data: responseData
+                    data: responseData,
+                    nextCursor: response.headers.get('X-Next-Cursor')
                 };
             } catch (error) {
                 console.error(`API request error (${url}):`, error);
@@ -111,6 +130,35 @@ document.addEventListener('DOMContentLoaded', () => {
             }
         },
         
+        async refresh() {
+            if (!state.refreshToken) {
+                return false;
+            }
+            try {
+                const response = await fetch(config.apiEndpoints.refresh, {
+                    method: 'POST',
+                    headers: { 'Authorization': `Bearer ${state.refreshToken}` }
+                });
+                if (!response.ok) {
+                    return false;
+                }
+                const responseData = await response.json();
+                state.setAccessToken(responseData.access_token);
+                return true;
+            } catch (error) {
+                console.error('Token refresh error:', error);
+                return false;
+            }
+        },
+        
+        async logout() {
+            const tokens = [state.token, state.refreshToken].filter(Boolean);
+            await Promise.all(tokens.map(token => fetch(config.apiEndpoints.logout, {
+                method: 'POST',
+                headers: { 'Authorization': `Bearer ${token}` }
+            }).catch(error => console.error('Logout error:', error))));
+        },
+        
         async register(userData) {
             return await this.request(config.apiEndpoints.users, 'POST', userData);
         },
@@ -123,8 +171,11 @@ document.addEventListener('DOMContentLoaded', () => {
             return await this.request(config.apiEndpoints.journals, 'POST', journalData, true);
         },
         
-        async getJournals() {
-            return await this.request(config.apiEndpoints.journals, 'GET', null, true);
+        async getJournals(cursor = null) {
+            const url = cursor
+                ? `${config.apiEndpoints.journals}?cursor=${encodeURIComponent(cursor)}`
+                : config.apiEndpoints.journals;
+            return await this.request(url, 'GET', null, true);
         },
         
         async getJournalScore(journalId) {
@@ -279,20 +330,27 @@ document.addEventListener('DOMContentLoaded', () => {
             }, 3000);
         },
         
-        async loadJournals() {
+        async loadJournals(cursor = null) {
             if (!state.isAuthenticated()) {
                 this.showNotification('Please log in to view journals', 'error');
                 return;
             }
             
-            if (elements.journalsList) {
+            const loadMoreButton = elements.journalsList && elements.journalsList.querySelector('.load-more-btn');
+            if (cursor && loadMoreButton) {
+                loadMoreButton.disabled = true;
+                loadMoreButton.textContent = 'Loading...';
+            } else if (elements.journalsList) {
                 elements.journalsList.innerHTML = '<p class="loading">Loading journals...</p>';
             }
             
-            const result = await api.getJournals();
+            const result = await api.getJournals(cursor);
             
             if (!result.ok) {
-                if (elements.journalsList) {
+                if (cursor && loadMoreButton) {
+                    loadMoreButton.disabled = false;
+                    loadMoreButton.textContent = 'Load more';
+                } else if (elements.journalsList) {
                     elements.journalsList.innerHTML = '<p class="error">Failed to load journals. Please try again later.</p>';
                 }
                 this.showNotification(result.data.message || 'Error loading journals', 'error');
@@ -302,8 +360,18 @@ document.addEventListener('DOMContentLoaded', () => {
             const journals = result.data;
             
             if (elements.journalsList) {
-                if (journals.length > 0) {
-                    let journalsHTML = '<div class="journals-container">';
+                if (loadMoreButton) {
+                    loadMoreButton.remove();
+                }
+                
+                if (journals.length > 0 || cursor) {
+                    let container = elements.journalsList.querySelector('.journals-container');
+                    if (!cursor || !container) {
+                        elements.journalsList.innerHTML = '<div class="journals-container"></div>';
+                        container = elements.journalsList.querySelector('.journals-container');
+                    }
+                    
+                    let journalsHTML = '';
                     
                     journals.forEach(journal => {
                         journalsHTML += `
@@ -324,20 +392,24 @@ document.addEventListener('DOMContentLoaded', () => {
                         journalsHTML += `</div>`;
                     });
                     
-                    journalsHTML += '</div>';
-                    elements.journalsList.innerHTML = journalsHTML;
+                    container.insertAdjacentHTML('beforeend', journalsHTML);
                     
-                    setTimeout(() => {
-                        const scoreButtons = document.querySelectorAll('.view-score-btn');
-                        if (scoreButtons.length > 0) {
-                            scoreButtons.forEach(button => {
-                                button.addEventListener('click', (e) => {
-                                    const journalId = e.target.getAttribute('data-journal-id');
-                                    this.loadJournalScore(journalId);
-                                });
-                            });
-                        }
-                    }, 0);
+                    container.querySelectorAll('.view-score-btn:not([data-bound])').forEach(button => {
+                        button.setAttribute('data-bound', 'true');
+                        button.addEventListener('click', (e) => {
+                            const journalId = e.target.getAttribute('data-journal-id');
+                            this.loadJournalScore(journalId);
+                        });
+                    });
+                    
+                    if (result.nextCursor) {
+                        const nextCursor = result.nextCursor;
+                        const button = document.createElement('button');
+                        button.className = 'load-more-btn';
+                        button.textContent = 'Load more';
+                        button.addEventListener('click', () => this.loadJournals(nextCursor));
+                        elements.journalsList.appendChild(button);
+                    }
                 } else {
                     elements.journalsList.innerHTML = '<p>You have not created any journal entries yet.</p>';
                 }
@@ -375,7 +447,28 @@ document.addEventListener('DOMContentLoaded', () => {
             
             const data = result.data;
             
+            if (result.status === 202 || data.status === 'pending') {
+                if (scoreButton) {
+                    scoreButton.disabled = false;
+                    scoreButton.textContent = 'Check Again';
+                    
+                    let pendingMsg = scoreButton.parentNode.querySelector('.score-pending');
+                    if (!pendingMsg) {
+                        pendingMsg = document.createElement('p');
+                        pendingMsg.className = 'score-pending';
+                        scoreButton.insertAdjacentElement('beforebegin', pendingMsg);
+                    }
+                    pendingMsg.textContent = 'Score is still being calculated. Check again in a moment.';
+                }
+                return;
+            }
+            
             if (scoreButton && data.score) {
+                const pendingMsg = scoreButton.parentNode.querySelector('.score-pending');
+                if (pendingMsg) {
+                    pendingMsg.remove();
+                }
+                
                 const scoreDetails = document.createElement('div');
                 scoreDetails.className = 'score-details';
                 scoreDetails.innerHTML = this.renderScoreDetails(data.score);
@@ -385,14 +478,20 @@ document.addEventListener('DOMContentLoaded', () => {
         },
         
         renderScoreDetails(score) {
+            const reserved = ['total', 'tokens', 'normalized'];
+            const categories = Object.keys(score)
+                .filter(name => !reserved.includes(name))
+                .map(name => {
+                    const label = name.replace(/_/g, ' ').replace(/\b\w/g, letter => letter.toUpperCase());
+                    return `<li>${this.sanitizeHTML(label)}: ${score[name]}</li>`;
+                })
+                .join('');
+            
             return `
                 <div class="score-details">
                     <h5>Journal Score</h5>
                     <ul>
-                        <li>Positive Emotion: ${score.positive_emotion}</li>
-                        <li>Negative Emotion: ${score.negative_emotion}</li>
-                        <li>Social: ${score.social}</li>
-                        <li>Cognitive: ${score.cognitive}</li>
+                        ${categories}
                         <li>Total Score: ${score.total}</li>
                     </ul>
                 </div>
@@ -460,7 +559,8 @@ document.addEventListener('DOMContentLoaded', () => {
                     { 
                         username: result.data.username || username,
                         id: result.data.user_id ? String(result.data.user_id) : null
-                    }
+                    },
+                    result.data.refresh_token
                 );
                 
                 elements.loginForm.reset();
@@ -505,7 +605,8 @@ document.addEventListener('DOMContentLoaded', () => {
             }
         },
         
-        handleLogout() {
+        async handleLogout() {
+            await api.logout();
             state.clearAuth();
             ui.updateLoginStatus();
             ui.showNotification('Logged out successfully', 'info');
@@ -35,6 +35,8 @@ def app():
         db.session.commit()
     
     yield app
+    
+    app.extensions['scoring_queue'].shutdown()
 
 @pytest.fixture
 def client(app):
@@ -0,0 +1,61 @@
+from app import db
+from app.models.journal import JournalScore
+from app.models.user import User
+
+def _admin_headers(app, client):
+    app.config['ADMIN_USERNAMES'] = ['admin']
+    with app.app_context():
+        user = User(username='admin', email='admin@example.com')
+        user.set_password('password')
+        db.session.add(user)
+        db.session.commit()
+    token = client.post('/login', json={'username': 'admin', 'password': 'password'}).get_json()['access_token']
+    return {'Authorization': f'Bearer {token}'}
+
+def test_publish_lexicon(app, client, auth_headers):
+    """Test an administrator publishes a lexicon that new scores are computed and tagged with."""
+    headers = _admin_headers(app, client)
+    
+    response = client.post('/admin/lexicon', json={
+        'categories': {'positive_emotion': ['happy', 'serene'], 'social': ['team']},
+        'note': 'add serene'
+    }, headers=headers)
+    assert response.status_code == 201
+    version = response.get_json()['version']
+    
+    response = client.post('/journals', json={'text': 'I feel serene.'}, headers=auth_headers)
+    assert response.get_json()['score']['positive_emotion'] == 1
+    with app.app_context():
+        assert db.session.get(JournalScore, 1).lexicon_version == version
+    
+    data = client.get('/admin/lexicon', headers=headers).get_json()
+    assert data['published_version'] == data['loaded_version'] == version
+    assert data['versions'][0] == {**data['versions'][0], 'note': 'add serene', 'word_count': 3}
+
+def test_publish_lexicon_requires_admin(app, client, auth_headers):
+    """Test non-administrators and invalid word lists are rejected."""
+    assert client.post('/admin/lexicon', json={}, headers=auth_headers).status_code == 403
+    
+    headers = _admin_headers(app, client)
+    response = client.post('/admin/lexicon', json={'categories': {'mood': {'calm': 'high'}}}, headers=headers)
+    assert response.status_code == 400
+    assert 'mood' in response.get_json()['message']
+    
+    for body in ([1], 'x'):
+        response = client.post('/admin/lexicon', json=body, headers=headers)
+        assert response.status_code == 400
+        assert response.get_json()['message'] == 'Request body must be a JSON object'
+
+def test_publish_lexicon_command(app, tmp_path):
+    """Test publishing a word list file from the CLI."""
+    words_file = tmp_path / 'words.json'
+    words_file.write_text('{"cognitive": ["ponder"]}')
+    
+    result = app.test_cli_runner().invoke(args=['publish-lexicon', '--file', str(words_file), '--note', 'ponder'])
+    
+    assert 'Published lexicon version 1' in result.output
+    
+    words_file.write_text('{"total": ["calm"]}')
+    result = app.test_cli_runner().invoke(args=['publish-lexicon', '--file', str(words_file)])
+    assert result.exit_code != 0
+    assert 'total is reserved' in result.output
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import pytest
+
+pytest.importorskip('a2wsgi')
+
+from app.asgi import create_asgi_app
+
+def _request(app, messages, headers=()):
+    """Run one POST /journals through the ASGI app and return the sent messages."""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'POST',
+        'scheme': 'http', 'path': '/journals', 'raw_path': b'/journals', 'query_string': b'',
+        'root_path': '', 'headers': list(headers), 'client': ('127.0.0.1', 1234), 'server': ('localhost', 80)
+    }
+    pending = list(messages)
+    sent = []
+    
+    async def receive():
+        if pending:
+            return pending.pop(0)
+        return {'type': 'http.disconnect'}
+    
+    async def send(message):
+        sent.append(message)
+    
+    asyncio.run(create_asgi_app(app)(scope, receive, send))
+    return sent
+
+def test_asgi_rejects_bodies_over_max_content_length(app):
+    """Test oversized bodies get 413 while they are read, declared or not."""
+    app.config['MAX_CONTENT_LENGTH'] = 10
+    
+    sent = _request(app, [], headers=[(b'content-length', b'100')])
+    assert sent[0]['status'] == 413
+    
+    chunks = [{'type': 'http.request', 'body': b'x' * 6, 'more_body': True}] * 3
+    sent = _request(app, chunks)
+    assert sent[0]['status'] == 413
+    assert json.loads(sent[1]['body']) == {'message': 'Request body too large'}
+
+def test_asgi_passes_small_bodies_to_flask(app):
+    """Test bodies within the limit reach the Flask app."""
+    app.config['MAX_CONTENT_LENGTH'] = 1024
+    body = json.dumps({'text': 'hello'}).encode()
+    
+    sent = _request(app, [{'type': 'http.request', 'body': body, 'more_body': False}],
+                    headers=[(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())])
+    
+    assert sent[0]['status'] == 401
+
+def test_wsgi_rejects_declared_oversized_bodies(app, client, auth_headers):
+    """Test the Flask app answers an oversized Content-Length with 413 instead of an error."""
+    app.config['MAX_CONTENT_LENGTH'] = 10
+    
+    response = client.post('/journals', json={'text': 'a longer journal entry'}, headers=auth_headers)
+    
+    assert response.status_code == 413
+    assert response.get_json()['message'] == 'Request body too large'
@@ -1,5 +1,13 @@
 import pytest
+from datetime import datetime, timedelta
+from flask_jwt_extended import decode_token
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+from app import db
 from app.models.user import User
+from app.models.token_blocklist import TokenBlocklist
+from app.services.blocklist import DatabaseBlocklist
+from app.services.passwords import PasswordHasher, hash_prefix
 
 def test_register_user(client):
     """Test user registration."""
@@ -64,4 +72,175 @@ def test_login_invalid(client):
     })
     
     assert response.status_code == 401
-    assert 'Invalid username or password' in response.get_json()['message']
\ No newline at end of file
+    assert 'Invalid username or password' in response.get_json()['message']
+
+def count_user_queries(app):
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM user' in statement:
+            statements.append(statement)
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+    return statements
+
+def test_user_lookup_is_cached(app, client, auth_headers):
+    """Test repeated authenticated requests resolve the user from the cache."""
+    statements = count_user_queries(app)
+    
+    for _ in range(3):
+        assert client.get('/journals', headers=auth_headers).status_code == 200
+    
+    assert len(statements) == 1
+
+def test_user_cache_invalidated_on_change(app, client, auth_headers):
+    """Test changing a user evicts the cached identity."""
+    client.get('/journals', headers=auth_headers)
+    resolver = app.extensions['identity_resolver']
+    
+    with app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        user_id = user.id
+        assert resolver.cache.get(user_id).email == 'test@example.com'
+        
+        user.email = 'changed@example.com'
+        db.session.commit()
+        
+        assert resolver.cache.get(user_id) is None
+
+def test_user_lookup_trusts_claims(app, client, auth_headers):
+    """Test claim-trusting mode never reads the user table."""
+    app.extensions['identity_resolver'].trust_claims = True
+    statements = count_user_queries(app)
+    
+    assert client.get('/journals', headers=auth_headers).status_code == 200
+    
+    assert statements == []
+
+def test_login_rehashes_with_new_parameters(app, client):
+    """Test a successful login upgrades a hash made with old parameters."""
+    client.post('/users', json={
+        'username': 'rehashuser',
+        'email': 'rehash@example.com',
+        'password': 'password123'
+    })
+    
+    app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+    app.extensions['password_hasher'] = PasswordHasher(app)
+    
+    response = client.post('/login', json={'username': 'rehashuser', 'password': 'password123'})
+    assert response.status_code == 200
+    
+    with app.app_context():
+        user = User.query.filter_by(username='rehashuser').first()
+        assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+        assert user.check_password('password123')
+
+def test_user_password_methods_use_configured_hasher(app):
+    """Test the model's password helpers hash with the configured parameters."""
+    app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+    app.extensions['password_hasher'] = PasswordHasher(app)
+    
+    with app.app_context():
+        user = User(username='hasheduser', email='hashed@example.com')
+        user.set_password('password123')
+        
+        assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+        assert user.check_password('password123')
+        assert not user.check_password('wrong')
+
+def test_hash_prefix_matches_werkzeug():
+    """Test rehash prefixes are derived from the method exactly as werkzeug writes them."""
+    for method in ('pbkdf2', 'pbkdf2:sha512', 'pbkdf2:sha256:1000', 'scrypt', 'scrypt:1024:8:1'):
+        assert hash_prefix(method) == generate_password_hash('x', method).split('$', 1)[0]
+
+def test_password_hashing_in_process_pool(app):
+    """Test hashing and verification through the process pool."""
+    app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_METHOD='pbkdf2:sha256:1000')
+    hasher = PasswordHasher(app)
+    try:
+        password_hash = hasher.hash('secret')
+        assert hasher.verify(password_hash, 'secret')
+        assert not hasher.verify(password_hash, 'wrong')
+        assert not hasher.needs_rehash(password_hash)
+    finally:
+        hasher.shutdown()
+
+def test_login_sheds_load_when_hasher_busy(app, client):
+    """Test logins get 503 instead of queueing when the hash pool is saturated."""
+    client.post('/users', json={
+        'username': 'busyuser',
+        'email': 'busy@example.com',
+        'password': 'password123'
+    })
+    
+    app.config['PASSWORD_HASH_MAX_PENDING'] = 1
+    hasher = PasswordHasher(app)
+    hasher._slots.acquire()
+    app.extensions['password_hasher'] = hasher
+    
+    response = client.post('/login', json={'username': 'busyuser', 'password': 'password123'})
+    
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+def login_tokens(client):
+    client.post('/users', json={
+        'username': 'tokenuser',
+        'email': 'token@example.com',
+        'password': 'password123'
+    })
+    return client.post('/login', json={'username': 'tokenuser', 'password': 'password123'}).get_json()
+
+def test_refresh_token(client):
+    """Test a refresh token yields a working access token."""
+    tokens = login_tokens(client)
+    
+    response = client.post('/token/refresh', headers={'Authorization': f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 200
+    
+    access_token = response.get_json()['access_token']
+    response = client.get('/journals', headers={'Authorization': f'Bearer {access_token}'})
+    assert response.status_code == 200
+
+def test_refresh_requires_refresh_token(client):
+    """Test an access token cannot be used to refresh."""
+    tokens = login_tokens(client)
+    
+    response = client.post('/token/refresh', headers={'Authorization': f"Bearer {tokens['access_token']}"})
+    
+    assert response.status_code == 401
+
+def test_logout_revokes_token(app, client):
+    """Test revoked tokens are rejected, including by another worker's blocklist."""
+    tokens = login_tokens(client)
+    headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+    
+    assert client.post('/logout', headers=headers).status_code == 200
+    
+    response = client.get('/journals', headers=headers)
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'token_revoked'
+    
+    with app.app_context():
+        other_worker = DatabaseBlocklist(app)
+        assert other_worker.is_revoked(decode_token(tokens['access_token'])['jti'])
+        assert TokenBlocklist.query.count() == 1
+
+def test_blocklist_sync_sees_rows_committed_out_of_order(app):
+    """Test a revocation with a lower id committed after a higher one is still picked up."""
+    expires_at = datetime.utcnow() + timedelta(hours=1)
+    with app.app_context():
+        worker = DatabaseBlocklist(app)
+        db.session.add(TokenBlocklist(id=5, jti='later-id', token_type='access', expires_at=expires_at))
+        db.session.commit()
+        worker.sync()
+        
+        db.session.add(TokenBlocklist(id=3, jti='earlier-id', token_type='access', expires_at=expires_at,
+                                      created_at=datetime.utcnow() - timedelta(seconds=10)))
+        db.session.commit()
+        worker.sync()
+        
+        assert worker.is_revoked('later-id')
+        assert worker.is_revoked('earlier-id')
@@ -0,0 +1,104 @@
+import json
+import pytest
+from app import create_app, db
+from app.models.user import User
+from app.models.journal import Journal, JournalScore
+from app.models.word_category import WordCategory, Word
+from app.models.score_rollup import ScoreRollup
+from app.rescore_db import rescore_journals
+from app.services.bulk_scoring import VectorizedScorer
+from app.services.lexicon import get_lexicon, publish_lexicon
+from app.services.text_analyzer import TextAnalyzer
+
+def test_vectorized_scores_match_analyzer(app):
+    """Test the vectorized engine agrees with TextAnalyzer.analyze_text."""
+    texts = [
+        "I am happy and I know it.",
+        "I believe my friend is happy but my family is sad.",
+        "",
+        "Nothing to see here."
+    ]
+    
+    with app.app_context():
+        scorer = VectorizedScorer()
+        assert scorer.score_texts(texts) == [TextAnalyzer.analyze_text(text) for text in texts]
+
+def test_rescore_journals(app, client, auth_headers):
+    """Test rescoring picks up lexicon changes and scores unscored journals."""
+    client.post('/journals', json={'text': 'I feel serene with my team.'}, headers=auth_headers)
+    
+    with app.app_context():
+        db.session.add(Journal(text='Serene and happy.', user_id=1))
+        category = WordCategory.query.filter_by(name='positive_emotion').first()
+        db.session.add(Word(word='serene', category_id=category.id))
+        db.session.commit()
+        
+        assert rescore_journals(batch_size=1) == 2
+        
+        scores = [journal.scores for journal in Journal.query.order_by(Journal.id)]
+        assert scores[0].positive_emotion == 1
+        assert scores[0].total_score == 2
+        assert scores[1].positive_emotion == 2
+        assert ScoreRollup.query.filter_by(period='all').one().positive_emotion == 3
+
+def test_rescore_journals_with_process_pool(tmp_path):
+    """Test rescoring in worker processes against a file database."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'rescore.db'}",
+        'JWT_SECRET_KEY': 'test_secret_key'
+    })
+    
+    with app.app_context():
+        db.create_all()
+        category = WordCategory(name='positive_emotion')
+        db.session.add(category)
+        db.session.flush()
+        db.session.add(Word(word='happy', category_id=category.id))
+        db.session.add(User(id=1, username='pooluser', email='pool@example.com', password_hash='x'))
+        db.session.add_all(Journal(text=f'happy day {i}', user_id=1) for i in range(10))
+        db.session.commit()
+        
+        assert rescore_journals(batch_size=3, workers=2) == 10
+        assert JournalScore.query.count() == 10
+        assert all(score.positive_emotion == 1 for score in JournalScore.query)
+
+def test_rescore_journals_resumes_from_checkpoint(app, client, auth_headers, tmp_path):
+    """Test chunks recorded in a checkpoint are skipped."""
+    client.post('/journals/batch',
+               json=[{'text': 'I am happy.'}, {'text': 'I am sad.'}],
+               headers=auth_headers)
+    checkpoint = tmp_path / 'rescore.json'
+    checkpoint.write_text(json.dumps({'batch_size': 1, 'completed': [1]}))
+    
+    with app.app_context():
+        assert rescore_journals(batch_size=1, checkpoint=str(checkpoint)) == 1
+    
+    assert not checkpoint.exists()
+
+def test_rescore_command(app, client, auth_headers):
+    """Test the flask rescore command."""
+    client.post('/journals', json={'text': 'I am happy.'}, headers=auth_headers)
+    
+    result = app.test_cli_runner().invoke(args=['rescore', '--workers', '1'])
+    
+    assert result.exit_code == 0
+    assert 'Rescoring complete: 1 journals.' in result.output
+
+def test_rescore_stale_only(app, client, auth_headers):
+    """Test a targeted rescore only touches journals scored with another lexicon version."""
+    client.post('/journals', json={'text': 'I am happy.'}, headers=auth_headers)
+    
+    with app.app_context():
+        publish_lexicon({'positive_emotion': ['happy', 'glad']})
+    client.post('/journals', json={'text': 'I am glad.'}, headers=auth_headers)
+    
+    with app.app_context():
+        assert rescore_journals(stale_only=True) == 1
+        assert rescore_journals(stale_only=True) == 0
+        versions = {score.lexicon_version for score in JournalScore.query.all()}
+        assert versions == {get_lexicon().version}
+        
+        JournalScore.query.limit(1).one().category_scores = None
+        db.session.commit()
+        assert rescore_journals(stale_only=True) == 1
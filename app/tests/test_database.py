@@ -0,0 +1,178 @@
+import os
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import inspect, text
+from app import create_app, db
+from app.database import engine_options
+from app.models.word_category import WordCategory
+
+def test_engine_options_for_postgres():
+    """Test server databases get a tuned, pre-pinged pool."""
+    options = engine_options({
+        'SQLALCHEMY_DATABASE_URI': 'postgresql+psycopg2://user:secret@db/cognitive',
+        'DB_POOL_SIZE': 20,
+        'DB_MAX_OVERFLOW': 5
+    })
+    
+    assert options == {
+        'pool_pre_ping': True,
+        'pool_size': 20,
+        'max_overflow': 5,
+        'pool_recycle': 1800,
+        'pool_timeout': 30
+    }
+
+def test_engine_options_for_memory_sqlite():
+    """Test in-memory SQLite keeps its single static connection."""
+    assert engine_options({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'}) == {'pool_pre_ping': True}
+
+def test_sqlite_pragmas_applied(tmp_path):
+    """Test file-backed SQLite connections use WAL, a busy timeout and synchronous=NORMAL."""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'pragmas.db'}",
+        'JWT_SECRET_KEY': 'test_secret_key',
+        'SQLITE_BUSY_TIMEOUT': 2500
+    })
+    
+    with app.app_context():
+        assert db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert db.session.execute(text('PRAGMA busy_timeout')).scalar() == 2500
+        assert db.session.execute(text('PRAGMA synchronous')).scalar() == 1
+        assert db.engine.pool.size() == 5
+
+def _schema(engine):
+    inspector = inspect(engine)
+    return {
+        table: sorted((index['name'], tuple(index['column_names']), bool(index['unique']))
+                      for index in inspector.get_indexes(table))
+        for table in inspector.get_table_names() if table != 'alembic_version'
+    }
+
+def _triggers():
+    return db.session.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name")).all()
+
+def test_create_app_runs_no_ddl(tmp_path):
+    """Test booting the app leaves schema changes to migrations."""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'boot.db'}",
+        'JWT_SECRET_KEY': 'test_secret_key'
+    })
+    
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
+
+def test_seed_db_command(tmp_path):
+    """Test seeding is an explicit, repeatable CLI step."""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'seed.db'}"})
+    with app.app_context():
+        upgrade()
+    
+    runner = app.test_cli_runner()
+    assert 'seeded successfully' in runner.invoke(args=['seed-db']).output
+    assert 'already seeded' in runner.invoke(args=['seed-db']).output
+    
+    with app.app_context():
+        assert WordCategory.query.count() == 4
+
+def test_migrations_match_models(tmp_path):
+    """Test upgrading an empty database builds the same tables and indexes as the models."""
+    migrated = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'migrated.db'}"})
+    created = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'created.db'}"})
+    
+    with migrated.app_context():
+        upgrade()
+        migrated_schema = _schema(db.engine)
+        migrated_triggers = _triggers()
+    with created.app_context():
+        db.create_all()
+        created_schema = _schema(db.engine)
+        created_triggers = _triggers()
+    
+    assert migrated_schema == created_schema
+    assert migrated_triggers == created_triggers
+    assert 'journal_fts' in migrated_schema
+    assert ('ix_journal_score_journal_id', ('journal_id',), True) in migrated_schema['journal_score']
+    assert ('ix_word_word', ('word',), False) in migrated_schema['word']
+
+def test_migrations_adopt_existing_database(tmp_path):
+    """Test the initial revision indexes a database created before migrations existed."""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'legacy.db'}"})
+    
+    with app.app_context():
+        db.create_all()
+        db.session.execute(text('DROP TABLE journal_version'))
+        db.session.execute(text('DROP INDEX ix_journal_score_journal_id'))
+        db.session.execute(text('DROP INDEX ix_word_word'))
+        for name, _ in _triggers():
+            db.session.execute(text(f'DROP TRIGGER {name}'))
+        db.session.execute(text('DROP TABLE journal_fts'))
+        db.session.execute(text('DROP TABLE lexicon_version'))
+        db.session.execute(text('DROP INDEX ix_journal_score_lexicon_version'))
+        db.session.execute(text('ALTER TABLE journal_score DROP COLUMN lexicon_version'))
+        db.session.execute(text('ALTER TABLE journal_score DROP COLUMN category_scores'))
+        db.session.execute(text('ALTER TABLE journal_score DROP COLUMN token_count'))
+        db.session.execute(text('ALTER TABLE word DROP COLUMN weight'))
+        db.session.execute(text('DROP INDEX ix_token_blocklist_created_at'))
+        db.session.execute(text("INSERT INTO word_category (id, name) VALUES (1, 'social')"))
+        db.session.execute(text("INSERT INTO word (id, word, category_id) VALUES (1, 'team', 1)"))
+        db.session.execute(text("INSERT INTO user (id, username, email, password_hash) VALUES (1, 'u', 'u@example.com', 'x')"))
+        db.session.execute(text("INSERT INTO journal (id, text, user_id) VALUES (1, 'happy', 1)"))
+        db.session.execute(text('INSERT INTO journal_score (id, journal_id, total_score) VALUES (1, 1, 0), (2, 1, 1)'))
+        db.session.commit()
+        
+        upgrade()
+        
+        assert db.session.execute(text('SELECT id, total_score FROM journal_score')).all() == [(2, 1)]
+        assert ('ix_journal_score_journal_id', ('journal_id',), True) in _schema(db.engine)['journal_score']
+        assert db.session.execute(text('SELECT user_id, version FROM journal_version')).all() == [(1, 0)]
+        assert db.session.execute(text("SELECT rowid FROM journal_fts WHERE journal_fts MATCH 'happy'")).all() == [(1,)]
+        assert db.session.execute(text('SELECT id, words FROM lexicon_version')).all() == [(1, '{"social": ["team"]}')]
+        assert db.session.execute(text('SELECT word, weight FROM word')).all() == [('team', 1.0)]
+
+def test_migration_backfills_trend_rollups(tmp_path):
+    """Test week and month rollups are derived from the day rollups on upgrade."""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'trends.db'}"})
+    
+    with app.app_context():
+        upgrade(revision='0003')
+        db.session.execute(text("INSERT INTO user (id, username, email, password_hash) VALUES (1, 'u', 'u@example.com', 'x')"))
+        for day, count in (('2026-09-27', 1), ('2026-09-28', 2), ('2026-10-01', 4)):
+            db.session.execute(text(
+                'INSERT INTO score_rollup (user_id, period, period_start, journal_count, positive_emotion, '
+                "negative_emotion, social, cognitive, total_score) VALUES (1, 'day', :day, :count, :count, 0, 0, 0, :count)"
+            ), {'day': day, 'count': count})
+        db.session.commit()
+        
+        upgrade()
+        
+        rows = db.session.execute(text(
+            "SELECT period, period_start, journal_count FROM score_rollup WHERE period != 'day' ORDER BY period, period_start"
+        )).all()
+        assert rows == [('month', '2026-09-01', 3), ('month', '2026-10-01', 4),
+                        ('week', '2026-09-21', 1), ('week', '2026-09-28', 6)]
+
+@pytest.mark.skipif(not os.environ.get('TEST_POSTGRES_URI'), reason='TEST_POSTGRES_URI is not set')
+def test_postgres_round_trip():
+    """Test the API against PostgreSQL when a test database is available."""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': os.environ['TEST_POSTGRES_URI'],
+        'JWT_SECRET_KEY': 'test_secret_key'
+    })
+    
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    
+    try:
+        client = app.test_client()
+        client.post('/users', json={'username': 'pguser', 'email': 'pg@example.com', 'password': 'password123'})
+        token = client.post('/login', json={'username': 'pguser', 'password': 'password123'}).get_json()['access_token']
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        assert client.post('/journals', json={'text': 'Hello'}, headers=headers).status_code == 201
+        assert client.post('/journals/batch', json=[{'text': 'a'}, {'text': 'b'}], headers=headers).status_code == 201
+        assert len(client.get('/journals', headers=headers).get_json()) == 3
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
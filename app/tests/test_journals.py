@@ -1,5 +1,15 @@
+import json
+from datetime import datetime, timedelta
 import pytest
+from sqlalchemy import event
+from werkzeug.http import http_date
+from app import db
 from app.models.journal import Journal, JournalScore
+from app.models.user import User
+from app.rescore_db import rescore_journals
+from app.services.http_cache import bump_all_journal_versions
+from app.services.lexicon import publish_lexicon
+from app.services.score_cache import SharedScoreCache, LocalKeyValueStore
 
 def test_create_journal(client, auth_headers):
     """Test journal creation and scoring."""
@@ -53,4 +63,347 @@ def test_unauthorized_access(client):
     """Test accessing journal without authentication."""
     response = client.post('/journals', json={'text': 'This should fail.'})
     
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+def test_create_journals_batch(client, auth_headers):
+    """Test creating several journals in one request."""
+    response = client.post('/journals/batch',
+                          json=[
+                              {'text': 'I am happy with my team.'},
+                              {'text': 'I think I was sad and angry.'}
+                          ],
+                          headers=auth_headers)
+    
+    assert response.status_code == 201
+    data = response.get_json()
+    
+    assert len(data) == 2
+    assert data[0]['score']['positive_emotion'] == 1
+    assert data[0]['score']['social'] == 1
+    assert data[1]['score']['negative_emotion'] == 2
+    assert data[1]['score']['total'] == 3
+    
+    with client.application.app_context():
+        journal = db.session.get(Journal, data[1]['journal_id'])
+        assert journal.text == 'I think I was sad and angry.'
+        assert journal.scores.cognitive == 1
+
+def test_create_journals_batch_rejects_invalid_items(client, auth_headers):
+    """Test a batch with an invalid item is rejected as a whole."""
+    response = client.post('/journals/batch',
+                          json=[{'text': 'I am happy.'}, {'text': '   '}],
+                          headers=auth_headers)
+    
+    assert response.status_code == 400
+    assert '1' in response.get_json()['errors']
+    
+    with client.application.app_context():
+        assert Journal.query.count() == 0
+
+def test_get_journals_paginates_with_cursor(client, auth_headers):
+    """Test keyset pagination over the journal list."""
+    client.post('/journals/batch',
+               json=[{'text': f'Entry number {i}'} for i in range(5)],
+               headers=auth_headers)
+    
+    response = client.get('/journals?limit=2', headers=auth_headers)
+    assert response.status_code == 200
+    first_page = response.get_json()
+    assert len(first_page) == 2
+    
+    seen = [journal['id'] for journal in first_page]
+    cursor = response.headers['X-Next-Cursor']
+    while cursor:
+        response = client.get(f'/journals?limit=2&cursor={cursor}', headers=auth_headers)
+        seen.extend(journal['id'] for journal in response.get_json())
+        cursor = response.headers.get('X-Next-Cursor')
+    
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+def test_get_journals_field_projection(client, auth_headers):
+    """Test the fields parameter drops text and can include scores."""
+    client.post('/journals', json={'text': 'I am happy.'}, headers=auth_headers)
+    
+    response = client.get('/journals?fields=created_at,score', headers=auth_headers)
+    assert response.status_code == 200
+    journal = response.get_json()[0]
+    
+    assert 'text' not in journal
+    assert journal['score']['positive_emotion'] == 1
+    
+    response = client.get('/journals?fields=title', headers=auth_headers)
+    assert response.status_code == 400
+
+def test_get_journals_invalid_cursor(client, auth_headers):
+    """Test a malformed cursor is rejected."""
+    response = client.get('/journals?cursor=not-a-cursor', headers=auth_headers)
+    
+    assert response.status_code == 400
+
+def test_export_journals_ndjson(client, auth_headers):
+    """Test exporting journals as newline-delimited JSON."""
+    client.post('/journals/batch',
+               json=[{'text': 'I am happy.'}, {'text': 'I feel sad.'}],
+               headers=auth_headers)
+    
+    response = client.get('/journals/export', headers=auth_headers)
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['text'] for line in lines] == ['I am happy.', 'I feel sad.']
+    assert lines[0]['score']['positive_emotion'] == 1
+    assert lines[1]['score']['negative_emotion'] == 1
+
+def test_create_journal_async_scoring(app, client, auth_headers):
+    """Test async mode persists the journal and scores it in the background."""
+    app.config['ASYNC_SCORING'] = True
+    
+    response = client.post('/journals',
+                          json={'text': 'I love my family.'},
+                          headers=auth_headers)
+    
+    assert response.status_code == 202
+    data = response.get_json()
+    assert data['status'] == 'pending'
+    
+    app.extensions['scoring_queue'].join(timeout=5)
+    
+    response = client.get(f"/journals/{data['journal_id']}/score", headers=auth_headers)
+    assert response.status_code == 200
+    score = response.get_json()
+    assert score['status'] == 'ready'
+    assert score['score']['positive_emotion'] == 1
+    assert score['score']['social'] == 1
+
+def test_scoring_sweep_requeues_unscored_journals(app, client, auth_headers):
+    """Test journals whose scoring job was lost are picked up by the sweep."""
+    app.config['ASYNC_SCORING'] = True
+    queue = app.extensions['scoring_queue']
+    with app.app_context():
+        journal = Journal(text='I love my family.', user_id=1, created_at=datetime.utcnow() - timedelta(minutes=5))
+        recent = Journal(text='I am happy.', user_id=1)
+        db.session.add_all([journal, recent])
+        db.session.commit()
+        journal_id = journal.id
+    
+    assert queue.sweep() == 1
+    queue.join(timeout=5)
+    
+    response = client.get(f'/journals/{journal_id}/score', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()['score']['social'] == 1
+    assert queue.sweep() == 0
+
+def test_get_journal_score_pending(app, client, auth_headers):
+    """Test a journal without a score reports a pending status."""
+    with app.app_context():
+        journal = Journal(text='Not scored yet.', user_id=1)
+        db.session.add(journal)
+        db.session.commit()
+        journal_id = journal.id
+    
+    response = client.get(f'/journals/{journal_id}/score', headers=auth_headers)
+    
+    assert response.status_code == 202
+    assert response.get_json()['status'] == 'pending'
+
+def test_get_journals_conditional(client, auth_headers):
+    """Test journal lists are revalidated with ETags."""
+    client.post('/journals', json={'text': 'I am happy.'}, headers=auth_headers)
+    
+    response = client.get('/journals', headers=auth_headers)
+    etag = response.headers['ETag']
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    assert 'Last-Modified' not in response.headers
+    
+    response = client.get('/journals', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    
+    response = client.get('/journals?fields=id', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    
+    response = client.get('/journals', headers={**auth_headers, 'If-Modified-Since': http_date(datetime.utcnow() + timedelta(days=1))})
+    assert response.status_code == 200
+    
+    client.post('/journals/batch', json=[{'text': 'I am sad.'}], headers=auth_headers)
+    response = client.get('/journals', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert len(response.get_json()) == 2
+
+def test_get_journal_score_conditional(app, client, auth_headers):
+    """Test a ready score revalidates to 304 and a pending one carries no validators."""
+    journal_id = client.post('/journals', json={'text': 'I love my team.'}, headers=auth_headers).get_json()['journal_id']
+    
+    response = client.get(f'/journals/{journal_id}/score', headers=auth_headers)
+    assert response.status_code == 200
+    
+    response = client.get(f'/journals/{journal_id}/score',
+                          headers={**auth_headers, 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    
+    with app.app_context():
+        journal = Journal(text='Not scored yet.', user_id=1)
+        db.session.add(journal)
+        db.session.commit()
+        pending_id = journal.id
+    
+    response = client.get(f'/journals/{pending_id}/score', headers=auth_headers)
+    assert response.status_code == 202
+    assert 'ETag' not in response.headers
+
+def test_get_journal_score_is_cached(app, client, auth_headers):
+    """Test scores cached at write time are served without reading journals."""
+    journal_id = client.post('/journals', json={'text': 'I am happy.'}, headers=auth_headers).get_json()['journal_id']
+    score_cache = app.extensions['score_cache']
+    
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+    
+    response = client.get(f'/journals/{journal_id}/score', headers=auth_headers)
+    
+    assert response.get_json()['score']['positive_emotion'] == 1
+    assert not [statement for statement in statements if 'journal_score' in statement]
+    assert score_cache.hits == 1
+    
+    with app.app_context():
+        rescore_journals()
+    assert len(score_cache) == 0
+    
+    client.get(f'/journals/{journal_id}/score', headers=auth_headers)
+    assert score_cache.misses == 1
+    assert len(score_cache) == 1
+
+def test_score_cache_ignores_entries_from_before_a_rescore(app, client, auth_headers):
+    """Test a rescore committed by another process is served although this worker's cache was not cleared."""
+    journal_id = client.post('/journals', json={'text': 'I am happy.'}, headers=auth_headers).get_json()['journal_id']
+    
+    with app.app_context():
+        journal_score = JournalScore.query.filter_by(journal_id=journal_id).one()
+        journal_score.category_scores = {**journal_score.category_scores, 'positive_emotion': 5}
+        bump_all_journal_versions()
+        db.session.commit()
+    
+    response = client.get(f'/journals/{journal_id}/score', headers=auth_headers)
+    
+    assert response.get_json()['score']['positive_emotion'] == 5
+    assert response.headers['ETag'] == client.get(f'/journals/{journal_id}/score', headers=auth_headers).headers['ETag']
+
+def test_shared_score_cache_clear_bumps_generation(app):
+    """Test clearing the shared cache hides entries from every worker using the store."""
+    store = LocalKeyValueStore()
+    first, second = SharedScoreCache(app, client=store), SharedScoreCache(app, client=store)
+    
+    first.set(1, 2, 7, {'total': 3})
+    assert second.get(1, 2, 7) == {'total': 3}
+    assert second.get(1, 2, 8) is None
+    
+    second.clear()
+    assert first.get(1, 2, 7) is None
+    assert (first.hits, first.misses) == (0, 1)
+
+def test_get_journal(client, auth_headers):
+    """Test retrieving a single journal with its score."""
+    journal_id = client.post('/journals', json={'text': 'I am happy.'}, headers=auth_headers).get_json()['journal_id']
+    
+    response = client.get(f'/journals/{journal_id}', headers=auth_headers)
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['id'] == journal_id
+    assert data['text'] == 'I am happy.'
+    assert data['score']['positive_emotion'] == 1
+    assert client.get('/journals/9999', headers=auth_headers).status_code == 404
+
+def test_orjson_provider_matches_default(app, client, auth_headers):
+    """Test the orjson provider produces the same documents as the default provider."""
+    pytest.importorskip('orjson')
+    from app.services.serialization import create_json_provider
+    client.post('/journals/batch', json=[{'text': 'I am happy.'}, {'text': 'Ça va, my friend 😊'}], headers=auth_headers)
+    expected = client.get('/journals?fields=text,created_at,score', headers=auth_headers).get_json()
+    
+    app.config['JSON_PROVIDER'] = 'orjson'
+    app.json = create_json_provider(app)
+    response = client.get('/journals?fields=text,created_at,score', headers=auth_headers)
+    
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.data) == expected
+    assert app.json.dumps({'b': 1, 'a': {'d': None}}) == '{"a":{"d":null},"b":1}'
+
+def test_custom_weighted_categories(app, client, auth_headers):
+    """Test published categories and weights show up in every score response."""
+    with app.app_context():
+        publish_lexicon({'positive_emotion': ['happy'], 'work': {'deadline': 2, 'review': 0.5}})
+    
+    response = client.post('/journals', json={'text': 'Happy the deadline review is done.'}, headers=auth_headers)
+    score = response.get_json()['score']
+    journal_id = response.get_json()['journal_id']
+    
+    assert score == {
+        'positive_emotion': 1, 'work': 2.5, 'total': 3.5, 'tokens': 6,
+        'normalized': {'positive_emotion': 16.6667, 'work': 41.6667, 'total': 58.3333}
+    }
+    with app.app_context():
+        app.extensions['score_cache'].clear()
+    assert client.get(f'/journals/{journal_id}/score', headers=auth_headers).get_json()['score'] == score
+    assert client.get('/journals?fields=score', headers=auth_headers).get_json()[0]['score'] == score
+    
+    batch = client.post('/journals/batch', json=[{'text': 'Happy the deadline review is done.'}], headers=auth_headers)
+    assert batch.get_json()[0]['score'] == score
+    
+    with app.app_context():
+        journal_score = JournalScore.query.filter_by(journal_id=journal_id).one()
+        assert (journal_score.positive_emotion, journal_score.total_score) == (1, 1)
+        journal_score.category_scores = journal_score.token_count = None
+        db.session.commit()
+        app.extensions['score_cache'].clear()
+    
+    legacy = client.get(f'/journals/{journal_id}/score', headers=auth_headers).get_json()['score']
+    assert legacy == {'positive_emotion': 1, 'negative_emotion': 0, 'social': 0, 'cognitive': 0,
+                      'total': 1, 'normalized': None, 'tokens': None}
+
+def test_search_journals(app, client, auth_headers):
+    """Test full-text search ranks, pages and stays within the user's journals."""
+    client.post('/journals/batch', json=[
+        {'text': 'I was happy with my team.'},
+        {'text': 'Team lunch, team games and team spirit.'},
+        {'text': 'A sad day.'},
+        {'text': 'The team met.'}
+    ], headers=auth_headers)
+    with app.app_context():
+        other = User(username='other', email='other@example.com', password_hash='-')
+        db.session.add(other)
+        db.session.flush()
+        db.session.add(Journal(text='My team is great.', user_id=other.id))
+        db.session.commit()
+    
+    response = client.get('/journals/search?q=team&limit=2', headers=auth_headers)
+    assert response.status_code == 200
+    first_page = response.get_json()
+    assert first_page[0]['text'] == 'Team lunch, team games and team spirit.'
+    
+    cursor = response.headers['X-Next-Cursor']
+    response = client.get(f'/journals/search?q=team&limit=2&cursor={cursor}', headers=auth_headers)
+    second_page = response.get_json()
+    assert 'X-Next-Cursor' not in response.headers
+    assert len({journal['id'] for journal in first_page + second_page}) == 3
+    
+    happy = client.get('/journals/search?q=HAPPY team', headers=auth_headers).get_json()
+    assert [journal['text'] for journal in happy] == ['I was happy with my team.']
+
+def test_search_journals_rejects_bad_input(client, auth_headers):
+    """Test queries without words and malformed cursors are rejected, and FTS syntax is inert."""
+    assert client.get('/journals/search?q=%22*()', headers=auth_headers).status_code == 400
+    assert client.get('/journals/search?q=team&cursor=bad', headers=auth_headers).status_code == 400
+    
+    response = client.get('/journals/search?q=NEAR OR text', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json() == []
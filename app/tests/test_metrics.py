@@ -0,0 +1,40 @@
+import json
+import logging
+import pytest
+
+def test_metrics_endpoint(app, client, auth_headers):
+    """Test request, SQL and analyzer metrics are exported in Prometheus format."""
+    app.config['METRICS_TOKEN'] = 'metrics-secret'
+    client.post('/journals', json={'text': 'I am happy.'}, headers=auth_headers)
+    client.get('/journals', headers=auth_headers)
+    
+    response = client.get('/metrics', headers={'Authorization': 'Bearer metrics-secret'})
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{blueprint="journals",endpoint="journals.create_journal",method="POST",status="201"} 1' in body
+    assert 'http_request_sql_queries_count{endpoint="journals.get_all_journals"} 1' in body
+    assert 'analyzer_duration_seconds_count 1' in body
+    assert 'sql_query_duration_seconds_count' in body
+    assert 'user_cache_misses_total 1' in body
+
+def test_metrics_require_token(app, client):
+    """Test metrics are hidden without METRICS_TOKEN and refused without the right token."""
+    assert client.get('/metrics').status_code == 404
+    
+    app.config['METRICS_TOKEN'] = 'metrics-secret'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer metrics-secret'}).status_code == 200
+
+def test_structured_request_log(app, client, auth_headers, caplog):
+    """Test each request is logged as one JSON record with timings."""
+    with caplog.at_level(logging.INFO, logger='app.requests'):
+        client.post('/journals', json={'text': 'I think so.'}, headers=auth_headers)
+    
+    records = [json.loads(record.getMessage()) for record in caplog.records if record.name == 'app.requests']
+    assert records[-1]['endpoint'] == 'journals.create_journal'
+    assert records[-1]['status'] == 201
+    assert records[-1]['sql_queries'] > 0
+    assert records[-1]['analyzer_ms'] >= 0
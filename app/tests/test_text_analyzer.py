@@ -1,4 +1,12 @@
 import pytest
+from sqlalchemy import text
+from app import create_app, db
+from app.models.word_category import WordCategory, Word
+from app.services import lexicon as lexicon_module
+from app.services.lexicon import (Lexicon, get_lexicon, invalidate_lexicon, load_category_words, publish_lexicon,
+                                  tokenize, warm_lexicon)
+from app.services.bulk_scoring import VectorizedScorer
+from app.services.scoring import score_columns
 from app.services.text_analyzer import TextAnalyzer
 
 def test_tokenize_text():
@@ -26,3 +34,116 @@ def test_analyze_text(app):
         assert scores['social'] == 2
         assert scores['cognitive'] == 1
         assert scores['total'] == 5
+
+def test_lexicon_is_compiled_once(app):
+    """Test the compiled lexicon is reused until the word lists change."""
+    with app.app_context():
+        lexicon = get_lexicon()
+        assert get_lexicon() is lexicon
+        assert lexicon.index['happy'] == (lexicon.categories.index('positive_emotion'),)
+
+def test_warm_lexicon(app, tmp_path):
+    """Test warm-up compiles the shared lexicon and tolerates an unmigrated database."""
+    lexicon = warm_lexicon(app)
+    with app.app_context():
+        assert get_lexicon() is lexicon
+    
+    invalidate_lexicon()
+    empty_app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'empty.db'}"})
+    assert warm_lexicon(empty_app) is None
+
+def test_lexicon_invalidated_on_word_change(app):
+    """Test adding a word recompiles the lexicon on the next analysis."""
+    with app.app_context():
+        assert TextAnalyzer.analyze_text("I feel serene.")['total'] == 0
+        
+        category = WordCategory.query.filter_by(name='positive_emotion').first()
+        db.session.add(Word(word='serene', category_id=category.id))
+        db.session.commit()
+        
+        scores = TextAnalyzer.analyze_text("I feel serene.")
+        assert scores['positive_emotion'] == 1
+        assert scores['total'] == 1
+
+def test_lexicon_matches_phrases():
+    """Test hyphenated and multi-word entries match as a single hit."""
+    lexicon = Lexicon({
+        'social': ['co-worker', 'friend'],
+        'positive_emotion': ['happy', 'looking forward', 'looking forward to it'],
+        'negative_emotion': ['not happy']
+    })
+    
+    scores = lexicon.score_tokens(tokenize("My co-worker is not happy, but I am happy and looking forward to it."))
+    
+    assert scores['social'] == 1
+    assert scores['negative_emotion'] == 1
+    assert scores['positive_emotion'] == 2
+    assert list(lexicon.match(tokenize("looking forward, looking"))) == ['looking forward']
+
+def test_vectorized_scorer_matches_phrases():
+    """Test the bulk scorer agrees with the phrase matcher."""
+    lexicon = Lexicon({'social': ['co-worker', 'team'], 'cognitive': ['think']})
+    scorer = VectorizedScorer(lexicon)
+    
+    scores = scorer.score_texts(["I think my co-worker and team think alike.", "co worker"])
+    
+    assert scores[0] == {'social': 2, 'cognitive': 2, 'total': 4, 'tokens': 9}
+    assert scores[1] == {'social': 1, 'cognitive': 0, 'total': 1, 'tokens': 2}
+
+def test_weighted_lexicon():
+    """Test per-word weights and arbitrary categories in both scorers."""
+    lexicon = Lexicon({'work': {'deadline': 2, 'team meeting': 0.5}, 'social': ['team', 'team meeting']})
+    texts = ["The deadline moved and the team meeting too.", "Deadline, deadline, team."]
+    
+    scores = [lexicon.score_tokens(tokenize(text)) for text in texts]
+    
+    assert scores[0] == {'work': 2.5, 'social': 1, 'total': 3.5, 'tokens': 8}
+    assert scores[1] == {'work': 4, 'social': 1, 'total': 5, 'tokens': 3}
+    assert VectorizedScorer(lexicon).score_texts(texts) == scores
+
+def test_score_columns_round_half_up():
+    """Test rollup columns round halves up and total only the built-in categories."""
+    columns = score_columns({'positive_emotion': 0.5, 'social': 2.5, 'work': 4, 'total': 7, 'tokens': 10})
+    
+    assert (columns['positive_emotion'], columns['social'], columns['negative_emotion']) == (1, 3, 0)
+    assert columns['total_score'] == 4
+    assert columns['category_scores'] == {'positive_emotion': 0.5, 'social': 2.5, 'work': 4}
+
+def test_published_lexicon_version(app):
+    """Test publishing swaps the lexicon and scores record the version that produced them."""
+    with app.app_context():
+        assert get_lexicon().version is None
+        
+        version = publish_lexicon({'positive_emotion': ['serene'], 'social': ['team']}, note='calm')
+        
+        lexicon = get_lexicon()
+        assert lexicon.version == version.id
+        assert TextAnalyzer.analyze_text('I am happy and serene.', lexicon)['positive_emotion'] == 1
+        assert load_category_words() == {'positive_emotion': {'serene': 1.0}, 'social': {'team': 1.0}}
+        
+        with pytest.raises(ValueError):
+            publish_lexicon({'total': ['calm']})
+
+def test_lexicon_picks_up_versions_published_elsewhere(app):
+    """Test a version published by another process is loaded after the sync interval."""
+    app.config['LEXICON_SYNC_INTERVAL'] = 60
+    with app.app_context():
+        lexicon = get_lexicon()
+        db.session.execute(text(
+            "INSERT INTO lexicon_version (id, words, created_at) VALUES (7, '{\"cognitive\": [\"serene\"]}', CURRENT_TIMESTAMP)"
+        ))
+        db.session.commit()
+        assert get_lexicon() is lexicon
+        
+        lexicon_module._next_check = 0.0
+        assert get_lexicon().version == 7
+        assert TextAnalyzer.analyze_text('I feel serene.')['cognitive'] == 1
+
+def test_lexicon_refresh_does_not_block_readers(app):
+    """Test threads keep the current lexicon while another thread holds the refresh lock."""
+    with app.app_context():
+        lexicon = get_lexicon()
+        invalidate_lexicon()
+        with lexicon_module._lock:
+            assert get_lexicon() is lexicon
+        assert get_lexicon() is not lexicon
@@ -0,0 +1,114 @@
+import pytest
+from datetime import date, datetime, timedelta
+from app import db
+from app.models.journal import Journal
+from app.models.score_rollup import ScoreRollup
+from app.services.rollups import rebuild_rollups
+from app.services.scoring import score_journal
+
+def test_score_summary_all_time(client, auth_headers):
+    """Test the all-time summary reflects journals as they are written."""
+    client.post('/journals', json={'text': 'I am happy and I love my friend.'}, headers=auth_headers)
+    client.post('/journals/batch',
+               json=[{'text': 'I feel sad.'}, {'text': 'I think I am happy.'}],
+               headers=auth_headers)
+    
+    response = client.get('/users/me/score-summary', headers=auth_headers)
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['journal_count'] == 3
+    assert data['totals']['positive_emotion'] == 3
+    assert data['totals']['negative_emotion'] == 1
+    assert data['totals']['total'] == 6
+    assert data['averages']['total'] == 2.0
+
+def test_score_summary_window(app, client, auth_headers):
+    """Test day windows only include recent journals."""
+    client.post('/journals', json={'text': 'I am happy.'}, headers=auth_headers)
+    
+    with app.app_context():
+        old = Journal(text='I was sad.', user_id=1, created_at=datetime.utcnow() - timedelta(days=10))
+        db.session.add(old)
+        db.session.flush()
+        score_journal(old)
+        db.session.commit()
+    
+    response = client.get('/users/me/score-summary?window=7d', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()['journal_count'] == 1
+    assert response.get_json()['totals']['negative_emotion'] == 0
+    
+    response = client.get('/users/me/score-summary?window=all', headers=auth_headers)
+    assert response.get_json()['journal_count'] == 2
+    assert response.get_json()['totals']['negative_emotion'] == 1
+
+def test_rebuild_rollups(app, client, auth_headers):
+    """Test rollups can be recomputed from stored scores."""
+    client.post('/journals/batch',
+               json=[{'text': 'I am happy.'}, {'text': 'I am sad.'}],
+               headers=auth_headers)
+    
+    with app.app_context():
+        before = {(r.period, r.period_start): r.total_score for r in ScoreRollup.query.all()}
+        ScoreRollup.query.delete()
+        db.session.commit()
+        
+        rebuild_rollups()
+        db.session.commit()
+        
+        after = {(r.period, r.period_start): r.total_score for r in ScoreRollup.query.all()}
+        assert after == before
+        assert ScoreRollup.query.filter_by(period='all').one().journal_count == 2
+
+def test_score_summary_invalid_window(client, auth_headers):
+    """Test an unsupported window is rejected."""
+    response = client.get('/users/me/score-summary?window=forever', headers=auth_headers)
+    
+    assert response.status_code == 400
+
+def _journal_on(day, text):
+    journal = Journal(text=text, user_id=1, created_at=datetime.combine(day, datetime.min.time()))
+    db.session.add(journal)
+    db.session.flush()
+    score_journal(journal)
+
+def test_score_trends(app, client, auth_headers):
+    """Test weekly trends fill empty weeks and average over a moving window of journals."""
+    with app.app_context():
+        _journal_on(date(2026, 9, 1), 'I am happy.')
+        _journal_on(date(2026, 9, 2), 'I am happy and I love my family.')
+        _journal_on(date(2026, 9, 16), 'I am sad.')
+        db.session.commit()
+    
+    response = client.get('/users/me/trends?bucket=week&from=2026-09-01&to=2026-09-20&window=3', headers=auth_headers)
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['buckets'] == ['2026-08-31', '2026-09-07', '2026-09-14']
+    assert data['journal_count'] == [2, 0, 1]
+    assert data['averages']['positive_emotion'] == [1.5, None, 0.0]
+    assert data['averages']['total'] == [2.0, None, 1.0]
+    assert data['moving_averages']['positive_emotion'] == [1.5, 1.5, 1.0]
+    
+    response = client.get('/users/me/trends?bucket=month&from=2026-09-01&to=2026-10-31&window=1', headers=auth_headers)
+    data = response.get_json()
+    assert data['buckets'] == ['2026-09-01', '2026-10-01']
+    assert data['journal_count'] == [3, 0]
+    assert data['moving_averages']['social'] == [0.3333, None]
+
+def test_score_trends_invalid_parameters(client, auth_headers):
+    """Test unknown buckets, bad dates, reversed ranges and oversized ranges are rejected."""
+    for query in ('bucket=year', 'from=yesterday', 'from=2026-09-02&to=2026-09-01',
+                  'bucket=day&from=2020-01-01&to=2026-01-01', 'window=0'):
+        assert client.get(f'/users/me/trends?{query}', headers=auth_headers).status_code == 400
+    
+    assert client.get('/users/me/trends', headers=auth_headers).status_code == 200
+
+def test_score_trends_reject_dates_at_the_calendar_edges(client, auth_headers):
+    """Test ranges whose buckets or windows fall outside the calendar get 400 rather than an error."""
+    for query in ('bucket=day&from=9999-12-31&to=9999-12-31', 'bucket=day&to=0001-01-10',
+                  'bucket=day&from=0001-01-01&to=0001-01-02', 'bucket=month&from=9999-11-01&to=9999-12-31'):
+        response = client.get(f'/users/me/trends?{query}', headers=auth_headers)
+        assert response.status_code == 400
+        assert '9999-12-31' in response.get_json()['message']
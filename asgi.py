@@ -0,0 +1,5 @@
+from app.asgi import create_asgi_app
+from wsgi import app as flask_app, shutdown_executors
+
+# Experimental: serves the Flask app under uvicorn workers. See app/asgi.py.
+app = create_asgi_app(flask_app, shutdown=shutdown_executors)
@@ -0,0 +1,85 @@
+"""Micro-benchmarks for tokenization and scoring across text and lexicon sizes.
+
+Run from the repository root:
+
+    python -m pytest benchmarks
+    python -m pytest benchmarks --benchmark-compare     # against the last saved run
+"""
+import random
+import pytest
+from app.seed_db import WORD_LISTS
+from app.services.bulk_scoring import VectorizedScorer
+from app.services.lexicon import Lexicon, tokenize
+from benchmarks.bench_phrase_matcher import build_lexicon, build_text
+
+TEXT_SIZES = (50, 500, 5000)
+LEXICON_SIZES = (200, 2000, 10000)
+CATEGORY_COUNTS = (4, 40, 400)
+
+@pytest.fixture(scope='module')
+def seed_lexicon():
+    return Lexicon(WORD_LISTS)
+
+@pytest.mark.parametrize('text_size', TEXT_SIZES)
+def bench_tokenize(benchmark, text_size):
+    benchmark.group = 'tokenize'
+    text = build_text(text_size, WORD_LISTS, random.Random(text_size))
+    
+    tokens = benchmark(tokenize, text)
+    
+    assert len(tokens) >= text_size
+
+@pytest.mark.parametrize('text_size', TEXT_SIZES)
+def bench_score_seed_lexicon(benchmark, seed_lexicon, text_size):
+    benchmark.group = 'score: seed lexicon'
+    tokens = tokenize(build_text(text_size, WORD_LISTS, random.Random(text_size)))
+    
+    scores = benchmark(seed_lexicon.score_tokens, tokens)
+    
+    assert scores['total'] > 0
+
+@pytest.mark.parametrize('lexicon_size', LEXICON_SIZES)
+def bench_score_lexicon_size(benchmark, lexicon_size):
+    benchmark.group = 'score: 500 tokens by lexicon size'
+    rng = random.Random(lexicon_size)
+    category_words = build_lexicon(lexicon_size, rng)
+    lexicon = Lexicon(category_words)
+    tokens = tokenize(build_text(500, category_words, rng))
+    
+    scores = benchmark(lexicon.score_tokens, tokens)
+    
+    assert scores['total'] > 0
+
+@pytest.mark.parametrize('category_count', CATEGORY_COUNTS)
+def bench_score_category_count(benchmark, category_count):
+    benchmark.group = 'score: 500 tokens, 2000 weighted entries by category count'
+    rng = random.Random(category_count)
+    entries = [word for words in build_lexicon(2000, rng).values() for word in words]
+    category_words = {f'category_{index}': {} for index in range(category_count)}
+    for position, entry in enumerate(entries):
+        category_words[f'category_{position % category_count}'][entry] = rng.choice((0.5, 1, 2))
+    lexicon = Lexicon(category_words)
+    tokens = tokenize(build_text(500, category_words, rng))
+    
+    scores = benchmark(lexicon.score_tokens, tokens)
+    
+    assert scores['total'] > 0
+
+@pytest.mark.parametrize('lexicon_size', LEXICON_SIZES)
+def bench_compile_lexicon(benchmark, lexicon_size):
+    benchmark.group = 'compile lexicon'
+    category_words = build_lexicon(lexicon_size, random.Random(lexicon_size))
+    
+    lexicon = benchmark(Lexicon, category_words)
+    
+    assert len(lexicon) > 0
+
+def bench_vectorized_batch(benchmark, seed_lexicon):
+    benchmark.group = 'bulk rescoring: 1000 texts x 200 tokens'
+    rng = random.Random(7)
+    texts = [build_text(200, WORD_LISTS, rng) for _ in range(1000)]
+    scorer = VectorizedScorer(seed_lexicon)
+    
+    scores = benchmark(scorer.score_texts, texts)
+    
+    assert len(scores) == len(texts)
@@ -0,0 +1,39 @@
+"""Measure password verifications (logins) per second per core for hash settings.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_password_hashing
+    python -m benchmarks.bench_password_hashing --methods scrypt pbkdf2:sha256:600000 --workers 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHODS = ('pbkdf2:sha256:600000', 'pbkdf2:sha256:260000', 'scrypt:32768:8:1', 'scrypt:16384:8:1')
+
+def verifications_per_second(password_hash, duration):
+    count, started = 0, time.perf_counter()
+    while time.perf_counter() - started < duration:
+        check_password_hash(password_hash, 'benchmark-password')
+        count += 1
+    return count / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--methods', nargs='+', default=DEFAULT_METHODS)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--duration', type=float, default=2.0, help='seconds per measurement')
+    args = parser.parse_args()
+
+    print(f"{'method':<24} {'logins/s/core':>14} {'ms/login':>9} {f'logins/s x{args.workers}':>16}")
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for method in args.methods:
+            password_hash = generate_password_hash('benchmark-password', method)
+            single = verifications_per_second(password_hash, args.duration)
+            pooled = sum(executor.map(verifications_per_second, [password_hash] * args.workers, [args.duration] * args.workers))
+            print(f"{method:<24} {single:>14.1f} {1000 / single:>9.1f} {pooled:>16.1f}")
+
+if __name__ == '__main__':
+    main()
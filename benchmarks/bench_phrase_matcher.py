@@ -0,0 +1,68 @@
+"""Compare the compiled phrase matcher with the original per-category list scan.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_phrase_matcher
+"""
+import random
+import string
+import timeit
+from app.services.lexicon import Lexicon, tokenize
+
+CATEGORIES = ('positive_emotion', 'negative_emotion', 'social', 'cognitive')
+LEXICON_SIZES = (200, 2000, 10000)
+TEXT_SIZES = (50, 500, 5000)
+PHRASE_RATIO = 0.2
+
+def legacy_analyze(tokens, category_words):
+    """The scoring loop TextAnalyzer used before the lexicon was compiled."""
+    scores = {category: 0 for category in category_words}
+    for word in tokens:
+        for category, category_word_list in category_words.items():
+            if word in category_word_list:
+                scores[category] += 1
+    scores['total'] = sum(scores.values())
+    return scores
+
+def random_word(rng):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+def build_lexicon(size, rng):
+    category_words = {category: [] for category in CATEGORIES}
+    for position in range(size):
+        if rng.random() < PHRASE_RATIO:
+            entry = ' '.join(random_word(rng) for _ in range(rng.randint(2, 3)))
+        else:
+            entry = random_word(rng)
+        category_words[CATEGORIES[position % len(CATEGORIES)]].append(entry)
+    return category_words
+
+def build_text(size, category_words, rng):
+    vocabulary = [word for words in category_words.values() for word in words]
+    filler = [random_word(rng) for _ in range(500)]
+    return ' '.join(rng.choice(vocabulary) if rng.random() < 0.1 else rng.choice(filler) for _ in range(size))
+
+def time_per_call(function, budget=0.5):
+    """Seconds per call, calibrated so each measurement takes roughly `budget` seconds."""
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    if elapsed > budget:
+        return elapsed / number
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+def main():
+    rng = random.Random(42)
+    print(f"{'lexicon':>8} {'tokens':>7} {'legacy (ms)':>12} {'compiled (ms)':>14} {'speedup':>9}")
+
+    for lexicon_size in LEXICON_SIZES:
+        category_words = build_lexicon(lexicon_size, rng)
+        lexicon = Lexicon(category_words)
+
+        for text_size in TEXT_SIZES:
+            tokens = tokenize(build_text(text_size, category_words, rng))
+            legacy = time_per_call(lambda: legacy_analyze(tokens, category_words))
+            compiled = time_per_call(lambda: lexicon.score_tokens(tokens))
+            print(f"{lexicon_size:>8} {text_size:>7} {legacy * 1000:>12.3f} {compiled * 1000:>14.3f} {legacy / compiled:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""CPU cost of a full GET /journals page per JSON provider.
+
+Each benchmark serves one 200-entry page from an in-memory SQLite database
+through the test client, so the timing covers the query, serialization and
+JSON encoding of the response.
+
+Run from the repository root:
+
+    python -m pytest benchmarks/bench_serialization.py
+"""
+import random
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.user import User
+from app.seed_db import WORD_LISTS
+from app.services.lexicon import Lexicon, tokenize
+from app.services.scoring import score_columns
+from app.models.journal import Journal, JournalScore
+from benchmarks.bench_phrase_matcher import build_text
+
+PAGE_SIZE = 200
+
+@pytest.fixture(scope='module', params=['default', 'orjson'])
+def served_app(request):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'JWT_SECRET_KEY': 'bench-serialization-secret-key-32b',
+        'REQUEST_LOGGING': False,
+        'JSON_PROVIDER': request.param
+    })
+    rng = random.Random(21)
+    lexicon = Lexicon(WORD_LISTS)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', password_hash='-')
+        db.session.add(user)
+        db.session.flush()
+        for _ in range(PAGE_SIZE):
+            text = build_text(80, WORD_LISTS, rng)
+            journal = Journal(text=text, user_id=user.id)
+            db.session.add(journal)
+            db.session.flush()
+            db.session.add(JournalScore(journal_id=journal.id, **score_columns(lexicon.score_tokens(tokenize(text)))))
+        db.session.commit()
+        token = create_access_token(identity=user.id)
+    return app, {'Authorization': f'Bearer {token}'}
+
+@pytest.mark.parametrize('fields', ['id,text,created_at,updated_at', 'id,text,created_at,score'])
+def bench_get_journals(benchmark, served_app, fields):
+    benchmark.group = f'GET /journals: {PAGE_SIZE} entries, fields={fields}'
+    app, headers = served_app
+    client = app.test_client()
+    url = f'/journals?limit={PAGE_SIZE}&fields={fields}'
+    
+    response = benchmark(client.get, url, headers=headers)
+    
+    assert response.status_code == 200
+    assert len(response.get_json()) == PAGE_SIZE
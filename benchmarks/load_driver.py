@@ -0,0 +1,224 @@
+"""Replay API traffic against the app backed by a SQLite file and report latency.
+
+Traffic is a JSON-lines file, one request per line:
+
+    {"method": "POST", "path": "/journals", "json": {"text": "..."}}
+    {"method": "GET", "path": "/journals?limit=20"}
+
+Requests are sent through the Flask test client as one of the synthetic users
+(round-robin), so no server is needed. Paths may contain "{journal_id}", which
+is replaced by a journal created earlier by the same user. Without --traffic a
+mixed workload is generated.
+
+Run from the repository root:
+
+    python -m benchmarks.load_driver --requests 2000 --users 20
+    python -m benchmarks.load_driver --compare benchmarks/results/load-<timestamp>.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import event
+from werkzeug.exceptions import HTTPException
+from app import create_app, db
+from app.seed_db import seed_word_lists
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+SAMPLE_WORDS = (
+    'happy', 'sad', 'friend', 'think', 'family', 'angry', 'know', 'love', 'team', 'worried',
+    'today', 'work', 'walk', 'dinner', 'morning', 'rain', 'book', 'music', 'coffee', 'train'
+)
+
+class QueryCounter:
+    """Counts SQL statements executed on behalf of the current thread."""
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def reset(self):
+        self._local.count = 0
+
+    @property
+    def count(self):
+        return getattr(self._local, 'count', 0)
+
+def generate_traffic(count, rng):
+    """A read-heavy mix of journal writes, batch syncs, list polls and score lookups."""
+    def text():
+        return ' '.join(rng.choice(SAMPLE_WORDS) for _ in range(rng.randint(20, 200)))
+
+    traffic = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.3:
+            traffic.append({'method': 'POST', 'path': '/journals', 'json': {'text': text()}})
+        elif roll < 0.35:
+            traffic.append({'method': 'POST', 'path': '/journals/batch', 'json': [{'text': text()} for _ in range(20)]})
+        elif roll < 0.75:
+            traffic.append({'method': 'GET', 'path': '/journals?limit=20'})
+        elif roll < 0.95:
+            traffic.append({'method': 'GET', 'path': '/journals/{journal_id}/score'})
+        else:
+            traffic.append({'method': 'GET', 'path': '/users/me/score-summary?window=30d'})
+    return traffic
+
+def load_traffic(path):
+    with open(path) as traffic_file:
+        return [json.loads(line) for line in traffic_file if line.strip()]
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def create_users(client, count):
+    users = []
+    for number in range(count):
+        credentials = {'username': f'loaduser{number}', 'password': 'load-password'}
+        client.post('/users', json={**credentials, 'email': f'loaduser{number}@example.com'})
+        token = client.post('/login', json=credentials).get_json()['access_token']
+        users.append({'headers': {'Authorization': f'Bearer {token}'}, 'journal_ids': [], 'lock': threading.Lock()})
+    return users
+
+def endpoint_name(app, method, path):
+    adapter = app.url_map.bind('localhost')
+    try:
+        endpoint, _ = adapter.match(path.split('?')[0], method=method)
+    except HTTPException:
+        return f'{method} {path}'
+    return f'{method} {endpoint}'
+
+def run(app, traffic, users, concurrency, counter):
+    samples = defaultdict(list)
+    client = app.test_client()
+
+    def send(position, item):
+        user = users[position % len(users)]
+        path = item['path']
+        if '{journal_id}' in path:
+            with user['lock']:
+                if not user['journal_ids']:
+                    return None
+                path = path.replace('{journal_id}', str(random.choice(user['journal_ids'])))
+
+        counter.reset()
+        started = time.perf_counter()
+        response = client.open(path, method=item['method'], json=item.get('json'), headers=user['headers'])
+        elapsed = time.perf_counter() - started
+
+        if item['method'] == 'POST' and response.status_code in (201, 202):
+            body = response.get_json()
+            created = [entry['journal_id'] for entry in body] if isinstance(body, list) else [body['journal_id']]
+            with user['lock']:
+                user['journal_ids'].extend(created)
+
+        return endpoint_name(app, item['method'], item['path'].replace('{journal_id}', '1')), elapsed, counter.count, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda args: send(*args), enumerate(traffic)))
+    duration = time.perf_counter() - started
+
+    errors = 0
+    for result in results:
+        if result is None:
+            continue
+        name, elapsed, queries, status = result
+        samples[name].append((elapsed, queries))
+        errors += status >= 400
+
+    return samples, duration, errors
+
+def summarize(samples, duration, errors):
+    all_samples = [sample for route_samples in samples.values() for sample in route_samples]
+
+    def stats(route_samples):
+        latencies = [elapsed * 1000 for elapsed, _ in route_samples]
+        return {
+            'requests': len(route_samples),
+            'p50_ms': round(percentile(latencies, 0.50), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'queries_per_request': round(statistics.mean(queries for _, queries in route_samples), 2)
+        }
+
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'duration_s': round(duration, 3),
+        'throughput_rps': round(len(all_samples) / duration, 1),
+        'errors': errors,
+        'overall': stats(all_samples),
+        'routes': {name: stats(route_samples) for name, route_samples in sorted(samples.items())}
+    }
+
+def print_report(report, baseline=None):
+    print(f"{report['overall']['requests']} requests in {report['duration_s']}s "
+          f"({report['throughput_rps']} req/s, {report['errors']} errors)")
+    print(f"{'route':<40} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8}")
+    rows = [('overall', report['overall'])] + list(report['routes'].items())
+    for name, stats in rows:
+        line = (f"{name:<40} {stats['requests']:>6} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+                f"{stats['p99_ms']:>9} {stats['queries_per_request']:>8}")
+        previous = baseline and (baseline['overall'] if name == 'overall' else baseline['routes'].get(name))
+        if previous:
+            change = (stats['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100 if previous['p95_ms'] else 0.0
+            line += f"   p95 {change:+.1f}%, queries {stats['queries_per_request'] - previous['queries_per_request']:+.2f}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--traffic', help='JSON-lines traffic file; a mixed workload is generated if omitted')
+    parser.add_argument('--requests', type=int, default=1000, help='number of generated requests')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--compare', help='previous result file to compare against')
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    traffic = load_traffic(args.traffic) if args.traffic else generate_traffic(args.requests, rng)
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(directory, 'load.db')}",
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+            'JWT_SECRET_KEY': 'load-driver-secret-key-with-enough-bytes',
+            'JWT_ACCESS_TOKEN_EXPIRES': 86400
+        })
+        with app.app_context():
+            db.create_all()
+            seed_word_lists()
+            counter = QueryCounter(db.engine)
+
+        users = create_users(app.test_client(), args.users)
+        samples, duration, errors = run(app, traffic, users, args.concurrency, counter)
+
+    report = summarize(samples, duration, errors)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(report, baseline)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"load-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json")
+        with open(path, 'w') as result_file:
+            json.dump(report, result_file, indent=2)
+        print(f"Saved results to {path}")
+
+if __name__ == '__main__':
+    main()
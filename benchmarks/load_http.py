@@ -0,0 +1,164 @@
+"""HTTP load test of the real server in each gunicorn serving mode.
+
+For every mode a gunicorn server is started with gunicorn.conf.py against a
+seeded SQLite file. Optional slow clients open connections and send an
+incomplete request, as mobile clients on poor networks do, while the load
+clients poll GET /journals and post journals. The report shows throughput,
+latency and failed requests per mode.
+
+Run from the repository root:
+
+    python -m benchmarks.load_http --modes sync,gthread,asgi --workers 2 --slow-clients 8
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app import create_app, db
+from app.seed_db import seed_word_lists
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRET_KEY = 'load-http-secret-key-with-enough-bytes'
+METRICS_TOKEN = 'load-http-metrics-token'
+# gunicorn silently turns 'sync' into 'gthread' when threads > 1.
+MODES = {
+    'sync': ('wsgi:app', {'GUNICORN_WORKER_CLASS': 'sync', 'GUNICORN_THREADS': '1'}),
+    'gthread': ('wsgi:app', {'GUNICORN_WORKER_CLASS': 'gthread'}),
+    'asgi': ('asgi:app', {'GUNICORN_WORKER_CLASS': 'uvicorn_worker.UvicornWorker'})
+}
+
+def prepare_database(path):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'JWT_SECRET_KEY': SECRET_KEY})
+    with app.app_context():
+        db.create_all()
+        seed_word_lists()
+
+def start_server(mode, args, database_path):
+    target, mode_env = MODES[mode]
+    env = dict(
+        os.environ,
+        DATABASE_URI=f'sqlite:///{database_path}',
+        SECRET_KEY=SECRET_KEY,
+        METRICS_TOKEN=METRICS_TOKEN,
+        REQUEST_LOGGING='false',
+        PASSWORD_HASH_METHOD='pbkdf2:sha256:1000',
+        GUNICORN_BIND=f'127.0.0.1:{args.port}',
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        ASGI_THREADS=str(args.threads)
+    )
+    env.update(mode_env)
+    server = subprocess.Popen(['gunicorn', '-c', 'gunicorn.conf.py', target], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if request(args.port, 'GET', '/metrics', token=METRICS_TOKEN, timeout=1)[0] == 200:
+                return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f'{mode} server did not start')
+
+def request(port, method, path, body=None, token=None, timeout=10):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    try:
+        connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+def login(port):
+    credentials = {'username': 'loaduser', 'password': 'load-password'}
+    request(port, 'POST', '/users', {**credentials, 'email': 'load@example.com'})
+    status, body = request(port, 'POST', '/login', credentials)
+    return json.loads(body)['access_token']
+
+def open_slow_clients(port, token, count):
+    """Open connections that announce a journal upload but send only part of its body."""
+    head = (
+        'POST /journals HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+        f'Authorization: Bearer {token}\r\nContent-Length: 100\r\n\r\n{{"text": '
+    ).encode()
+    sockets = []
+    for _ in range(count):
+        slow = socket.create_connection(('127.0.0.1', port))
+        slow.sendall(head)
+        sockets.append(slow)
+    return sockets
+
+def run_load(port, token, args):
+    def one(number):
+        started = time.perf_counter()
+        try:
+            if number % 10 == 0:
+                status, _ = request(port, 'POST', '/journals', {'text': f'I am happy with my team {number}.'}, token)
+            else:
+                status, _ = request(port, 'GET', '/journals?limit=20', token=token)
+            ok = status < 400
+        except OSError:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(one, range(args.requests)))
+    duration = time.perf_counter() - started
+
+    latencies = sorted(elapsed for ok, elapsed in results if ok)
+    failed = sum(1 for ok, _ in results if not ok)
+    return {
+        'throughput': len(latencies) / duration,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else None,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else None,
+        'failed': failed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', default='sync,gthread,asgi')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8, help='threads per worker for gthread and asgi')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--slow-clients', type=int, default=0)
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    reports = {}
+    for mode in args.modes.split(','):
+        with tempfile.TemporaryDirectory() as directory:
+            database_path = os.path.join(directory, 'load.db')
+            prepare_database(database_path)
+            server = start_server(mode, args, database_path)
+            slow_clients = []
+            try:
+                token = login(args.port)
+                slow_clients = open_slow_clients(args.port, token, args.slow_clients)
+                reports[mode] = run_load(args.port, token, args)
+            finally:
+                for slow in slow_clients:
+                    slow.close()
+                server.terminate()
+                server.wait()
+
+    print(f"{'mode':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'failed':>8}")
+    for mode, report in reports.items():
+        p50 = f"{report['p50_ms']:.1f}" if report['p50_ms'] is not None else '-'
+        p99 = f"{report['p99_ms']:.1f}" if report['p99_ms'] is not None else '-'
+        print(f"{mode:<10}{report['throughput']:>10.1f}{p50:>10}{p99:>10}{report['failed']:>8}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Worker cold-start benchmark: how long a fresh process takes to serve its first scored journal.
+
+Each run starts a new interpreter, imports the WSGI entry point against an
+already migrated and seeded SQLite file (what a gunicorn worker does on boot)
+and then scores one text. The report shows the median and worst time of both
+steps over all runs.
+
+Run from the repository root:
+
+    python -m benchmarks.startup_time --runs 10
+    python -m benchmarks.startup_time --module app --attribute create_app
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from app import create_app, db
+from app.seed_db import seed_word_lists
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import {module}
+application = getattr({module}, {attribute!r})
+if callable(application) and not hasattr(application, 'wsgi_app'):
+    application = application()
+booted = time.perf_counter()
+from app.services.text_analyzer import TextAnalyzer
+with application.app_context():
+    TextAnalyzer.analyze_text('I am happy with my friend and I think so.')
+scored = time.perf_counter()
+print(json.dumps({{'boot': booted - start, 'first_score': scored - booted}}))
+"""
+
+def prepare_database(path):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+    with app.app_context():
+        db.create_all()
+        seed_word_lists()
+
+def measure(probe, env):
+    output = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--module', default='wsgi', help='module holding the WSGI app')
+    parser.add_argument('--attribute', default='app', help='app object or factory in that module')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'startup.db')
+        prepare_database(path)
+        env = dict(os.environ, DATABASE_URI=f'sqlite:///{path}')
+        probe = PROBE.format(module=args.module, attribute=args.attribute)
+        samples = [measure(probe, env) for _ in range(args.runs)]
+
+    for step in ('boot', 'first_score'):
+        values = [sample[step] * 1000 for sample in samples]
+        print(f"{step:<12} median {statistics.median(values):8.1f} ms   max {max(values):8.1f} ms")
+
+if __name__ == '__main__':
+    main()
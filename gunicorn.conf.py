@@ -0,0 +1,33 @@
+import gc
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', os.cpu_count() or 1))
+# 'sync' serves wsgi:app one request per worker; 'gthread' adds GUNICORN_THREADS
+# threads per worker; 'uvicorn_worker.UvicornWorker' serves asgi:app.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+# Load wsgi.py once in the master so the app and its warmed-up lexicon are
+# shared copy-on-write by every forked worker instead of built per worker.
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+def when_ready(server):
+    # Objects allocated before the fork are moved out of the collector's reach,
+    # so collections in the workers do not write to (and copy) shared pages.
+    if preload_app:
+        gc.freeze()
+
+def post_fork(server, worker):
+    # Connections opened by the master during warm-up must not be reused
+    # across processes; each worker starts with an empty pool.
+    if preload_app:
+        from app import db
+        from wsgi import app
+
+        with app.app_context():
+            db.engine.dispose(close=False)
+
+def worker_exit(server, worker):
+    from wsgi import shutdown_executors
+
+    shutdown_executors()
@@ -0,0 +1,139 @@
+"""initial schema with hot-path indexes
+
+Databases created by the old db.create_all() boot step already have some of
+these tables, so existing tables are kept and only the missing tables and
+indexes are created. Duplicate journal_score rows are collapsed onto the most
+recent one before the unique index on journal_score.journal_id is built.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 17:28:45.803871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('journal', 'ix_journal_created_at', ['created_at'], False),
+    ('journal', 'ix_journal_user_id_created_at', ['user_id', 'created_at'], False),
+    ('token_blocklist', 'ix_token_blocklist_expires_at', ['expires_at'], False),
+    ('word', 'ix_word_word', ['word'], False),
+    ('journal_score', 'ix_journal_score_journal_id', ['journal_id'], True),
+]
+
+
+def create_tables(existing):
+    if 'user' not in existing:
+        op.create_table('user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=256), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username')
+        )
+    if 'word_category' not in existing:
+        op.create_table('word_category',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+    if 'journal' not in existing:
+        op.create_table('journal',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'score_rollup' not in existing:
+        op.create_table('score_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=10), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('journal_count', sa.Integer(), nullable=False),
+        sa.Column('positive_emotion', sa.Integer(), nullable=False),
+        sa.Column('negative_emotion', sa.Integer(), nullable=False),
+        sa.Column('social', sa.Integer(), nullable=False),
+        sa.Column('cognitive', sa.Integer(), nullable=False),
+        sa.Column('total_score', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'period', 'period_start', name='uq_score_rollup_user_period')
+        )
+    if 'token_blocklist' not in existing:
+        op.create_table('token_blocklist',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(length=36), nullable=False),
+        sa.Column('token_type', sa.String(length=10), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('jti')
+        )
+    if 'word' not in existing:
+        op.create_table('word',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('word', sa.String(length=50), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['word_category.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'journal_score' not in existing:
+        op.create_table('journal_score',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('journal_id', sa.Integer(), nullable=False),
+        sa.Column('positive_emotion', sa.Integer(), nullable=True),
+        sa.Column('negative_emotion', sa.Integer(), nullable=True),
+        sa.Column('social', sa.Integer(), nullable=True),
+        sa.Column('cognitive', sa.Integer(), nullable=True),
+        sa.Column('total_score', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['journal_id'], ['journal.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    create_tables(existing)
+
+    if 'journal_score' in existing:
+        op.execute(
+            'DELETE FROM journal_score WHERE id NOT IN '
+            '(SELECT MAX(id) FROM journal_score GROUP BY journal_id)'
+        )
+
+    for table, name, columns, unique in INDEXES:
+        if table in existing and name in {index['name'] for index in inspector.get_indexes(table)}:
+            continue
+        op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    for table, name, columns, unique in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    op.drop_table('journal_score')
+    op.drop_table('word')
+    op.drop_table('token_blocklist')
+    op.drop_table('score_rollup')
+    op.drop_table('journal')
+    op.drop_table('word_category')
+    op.drop_table('user')
@@ -0,0 +1,38 @@
+"""per-user journal version for conditional GETs
+
+Every existing user gets a version row, so a later rescore, which bumps all
+rows, also changes the ETags of users who wrote their journals before this
+revision.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 17:52:10.418263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('journal_version',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute(
+        'INSERT INTO journal_version (user_id, version, updated_at) '
+        'SELECT id, 0, CURRENT_TIMESTAMP FROM "user"'
+    )
+
+
+def downgrade():
+    op.drop_table('journal_version')
@@ -0,0 +1,61 @@
+"""full-text search index over journal text
+
+SQLite gets an external-content FTS5 table kept in sync by triggers, filled
+from the existing journals; PostgreSQL gets a GIN index on the tsvector of
+the text. Other databases are left unchanged.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 18:24:37.512906
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS journal_fts USING fts5("
+    "text, user_id, content='journal', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS journal_fts_insert AFTER INSERT ON journal BEGIN "
+    "INSERT INTO journal_fts (rowid, text, user_id) VALUES (new.id, new.text, new.user_id); END",
+    "CREATE TRIGGER IF NOT EXISTS journal_fts_delete AFTER DELETE ON journal BEGIN "
+    "INSERT INTO journal_fts (journal_fts, rowid, text, user_id) VALUES ('delete', old.id, old.text, old.user_id); END",
+    "CREATE TRIGGER IF NOT EXISTS journal_fts_update AFTER UPDATE OF text, user_id ON journal BEGIN "
+    "INSERT INTO journal_fts (journal_fts, rowid, text, user_id) VALUES ('delete', old.id, old.text, old.user_id); "
+    "INSERT INTO journal_fts (rowid, text, user_id) VALUES (new.id, new.text, new.user_id); END",
+    "INSERT INTO journal_fts (journal_fts) VALUES ('rebuild')"
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS journal_fts_insert",
+    "DROP TRIGGER IF EXISTS journal_fts_delete",
+    "DROP TRIGGER IF EXISTS journal_fts_update",
+    "DROP TABLE IF EXISTS journal_fts"
+]
+
+POSTGRESQL_UPGRADE = [
+    "CREATE INDEX IF NOT EXISTS ix_journal_text_search ON journal USING gin (to_tsvector('english', text))"
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_journal_text_search"
+]
+
+
+def _run(statements):
+    for statement in statements.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+
+def upgrade():
+    _run({'sqlite': SQLITE_UPGRADE, 'postgresql': POSTGRESQL_UPGRADE})
+
+
+def downgrade():
+    _run({'sqlite': SQLITE_DOWNGRADE, 'postgresql': POSTGRESQL_DOWNGRADE})
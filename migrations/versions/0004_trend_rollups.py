@@ -0,0 +1,62 @@
+"""week and month score rollups for trend series
+
+Rollups are now also kept per week (starting Monday) and per month. They are
+derived here from the existing day rollups, which cover every scored journal;
+any week or month rows written before the upgrade are recomputed.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 18:58:12.204731
+
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('journal_count', 'positive_emotion', 'negative_emotion', 'social', 'cognitive', 'total_score')
+
+score_rollup = sa.table(
+    'score_rollup',
+    sa.column('user_id', sa.Integer),
+    sa.column('period', sa.String),
+    sa.column('period_start', sa.Date),
+    sa.column('updated_at', sa.DateTime),
+    *(sa.column(name, sa.Integer) for name in COLUMNS)
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    bind.execute(score_rollup.delete().where(score_rollup.c.period.in_(('week', 'month'))))
+
+    buckets = defaultdict(lambda: dict.fromkeys(COLUMNS, 0))
+    rows = bind.execute(
+        sa.select(score_rollup.c.user_id, score_rollup.c.period_start, *(score_rollup.c[name] for name in COLUMNS))
+        .where(score_rollup.c.period == 'day')
+    )
+    for row in rows:
+        day = row.period_start
+        for key in ((row.user_id, 'week', day - timedelta(days=day.weekday())),
+                    (row.user_id, 'month', day.replace(day=1))):
+            bucket = buckets[key]
+            for name in COLUMNS:
+                bucket[name] += getattr(row, name)
+
+    now = datetime.utcnow()
+    if buckets:
+        op.bulk_insert(score_rollup, [
+            {'user_id': user_id, 'period': period, 'period_start': period_start, 'updated_at': now, **values}
+            for (user_id, period, period_start), values in buckets.items()
+        ])
+
+
+def downgrade():
+    op.get_bind().execute(score_rollup.delete().where(score_rollup.c.period.in_(('week', 'month'))))
@@ -0,0 +1,52 @@
+"""published lexicon versions and the version each score was computed with
+
+The current word tables, if they hold any words, are published as the first
+version. Existing scores keep a NULL lexicon_version because the word lists
+they were computed with are unknown; `flask rescore --stale-only` rescores
+them.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 19:31:05.118240
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    lexicon_version = op.create_table('lexicon_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('words', sa.JSON(), nullable=False),
+    sa.Column('note', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('journal_score', sa.Column('lexicon_version', sa.Integer(), nullable=True))
+    op.create_index('ix_journal_score_lexicon_version', 'journal_score', ['lexicon_version'], unique=False)
+
+    rows = op.get_bind().execute(sa.text(
+        'SELECT word_category.name, word.word FROM word_category '
+        'JOIN word ON word.category_id = word_category.id ORDER BY word_category.id, word.id'
+    ))
+    words = {}
+    for category, word in rows:
+        words.setdefault(category, []).append(word)
+    if words:
+        op.bulk_insert(lexicon_version, [
+            {'words': words, 'note': 'word lists at upgrade', 'created_at': datetime.utcnow()}
+        ])
+
+
+def downgrade():
+    op.drop_index('ix_journal_score_lexicon_version', table_name='journal_score')
+    op.drop_column('journal_score', 'lexicon_version')
+    op.drop_table('lexicon_version')
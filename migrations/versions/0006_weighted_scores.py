@@ -0,0 +1,32 @@
+"""word weights and per-journal category scores with token counts
+
+Existing scores keep NULL category_scores and token_count; the API serves
+them from the built-in category columns without normalized scores until
+`flask rescore --stale-only` rescores them.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 21:12:44.503817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('word', sa.Column('weight', sa.Float(), server_default='1', nullable=False))
+    op.add_column('journal_score', sa.Column('category_scores', sa.JSON(), nullable=True))
+    op.add_column('journal_score', sa.Column('token_count', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('journal_score', 'token_count')
+    op.drop_column('journal_score', 'category_scores')
+    op.drop_column('word', 'weight')
@@ -0,0 +1,23 @@
+"""index token_blocklist.created_at for the blocklist sync
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 09:42:17.530214
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_token_blocklist_created_at', 'token_blocklist', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_token_blocklist_created_at', table_name='token_blocklist')
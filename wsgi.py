@@ -1,12 +1,21 @@
 from app import create_app
-from app.seed_db import seed_database
+from app.services.lexicon import warm_lexicon
 
 app = create_app()
 
-with app.app_context():
-    seed_database()
+if app.config.get('LEXICON_WARMUP'):
+    warm_lexicon(app)
+
+def shutdown_executors():
+    """Stop the password hashing and scoring pools before the worker exits.
+
+    Pool processes inherit both ends of their task pipe and would otherwise
+    outlive the worker that started them.
+    """
+    app.extensions['password_hasher'].shutdown()
+    app.extensions['scoring_queue'].shutdown()
 
 if __name__ == "__main__":
     from waitress import serve
     print("Serving application on http://localhost:5000")
-    serve(app, host="localhost", port=5000)
\ No newline at end of file
+    serve(app, host="localhost", port=5000)